@@ -0,0 +1,605 @@
+"""
+Measures the validation throughput for a set of representative datasets.
+
+The datasets (apart from RT Dose, which is read from the test fixtures) are
+created synthetically, so the benchmark can run offline and gives reproducible
+results. The DICOM information is read from existing JSON files, per default
+from the test fixtures. These contain only a few IODs, so the SR dataset is
+only benchmarked with the JSON files of a full standard revision.
+
+Four kinds of benchmarks are run for each dataset:
+    iod: `IODValidator.validate` for the already loaded dataset
+    dir: `DicomFileValidator.validate_dir` for a directory with variants
+         of the dataset written to disk, each with a different structure
+    series: `DicomFileValidator.validate_dir` for a directory with copies
+         of the dataset, as in a series of images
+    cached: the same as series, but with the structure cache, so that the
+         validation result of the first file is reused for the other files
+For each benchmark, the throughput (files/s), the latency percentiles per
+file and the peak memory allocated during validation are measured. The
+throughput and the latencies are measured in the same run. If the directory
+is validated in several processes (`--jobs`), the latencies of the directory
+benchmarks are not measured, as the files are validated in the worker
+processes.
+The results can be saved as JSON and compared to a previously saved baseline.
+The return value is the number of detected regressions; a cached benchmark
+that is slower than the related series benchmark is also counted as
+a regression, as the structure cache would be useless.
+The benchmark fails if any dataset cannot be validated (e.g. due to an
+unknown SOP class), as the measured times would be meaningless.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from pydicom import dcmread, dcmwrite
+from pydicom.dataset import Dataset, FileDataset, FileMetaDataset
+from pydicom.sequence import Sequence
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+from dicom_validator.spec_reader.edition_reader import EditionReader
+from dicom_validator.validator.dicom_file_validator import (
+    DicomFileValidator,
+    READERS,
+)
+from dicom_validator.validator.iod_validator import IODValidator
+
+FIXTURE_PATH = Path(__file__).parent.parent / "dicom_validator" / "tests" / "fixtures"
+CT_IMAGE_STORAGE = "1.2.840.10008.5.1.4.1.1.2"
+ENHANCED_XA_IMAGE_STORAGE = "1.2.840.10008.5.1.4.1.1.12.1.1"
+BASIC_TEXT_SR_STORAGE = "1.2.840.10008.5.1.4.1.1.88.11"
+
+
+class BenchmarkError(Exception):
+    """Raised if a benchmarked dataset cannot be validated."""
+
+
+def check_result(name, result):
+    """Raise a `BenchmarkError` if the validation result is a fatal error."""
+    if "fatal" in result:
+        raise BenchmarkError(f"{name}: {result['fatal']}")
+
+
+def _add_common_attributes(dataset, sop_class_uid, modality):
+    dataset.SOPClassUID = sop_class_uid
+    dataset.SOPInstanceUID = generate_uid(entropy_srcs=[sop_class_uid, "instance"])
+    dataset.StudyInstanceUID = generate_uid(entropy_srcs=[sop_class_uid, "study"])
+    dataset.SeriesInstanceUID = generate_uid(entropy_srcs=[sop_class_uid, "series"])
+    dataset.PatientName = "Test^Patient"
+    dataset.PatientID = "12345"
+    dataset.PatientBirthDate = "19700101"
+    dataset.PatientSex = "O"
+    dataset.StudyDate = "20240101"
+    dataset.StudyTime = "120000"
+    dataset.ReferringPhysicianName = ""
+    dataset.StudyID = "1"
+    dataset.AccessionNumber = ""
+    dataset.Modality = modality
+    dataset.SeriesNumber = 1
+    dataset.InstanceNumber = 1
+    dataset.Manufacturer = "dicom-validator"
+
+
+def _add_image_attributes(dataset, rows, columns, frames=1):
+    dataset.FrameOfReferenceUID = generate_uid(entropy_srcs=["frame of reference"])
+    dataset.PositionReferenceIndicator = ""
+    dataset.SamplesPerPixel = 1
+    dataset.PhotometricInterpretation = "MONOCHROME2"
+    dataset.Rows = rows
+    dataset.Columns = columns
+    dataset.BitsAllocated = 16
+    dataset.BitsStored = 12
+    dataset.HighBit = 11
+    dataset.PixelRepresentation = 0
+    dataset.PixelData = bytes(rows * columns * frames * 2)
+
+
+def ct_dataset():
+    """Return a single-frame CT image."""
+    dataset = Dataset()
+    _add_common_attributes(dataset, CT_IMAGE_STORAGE, "CT")
+    _add_image_attributes(dataset, 512, 512)
+    dataset.ImageType = ["ORIGINAL", "PRIMARY", "AXIAL"]
+    dataset.AcquisitionNumber = 1
+    dataset.ImagePositionPatient = [-250, -250, 0]
+    dataset.ImageOrientationPatient = [1, 0, 0, 0, 1, 0]
+    dataset.PixelSpacing = [0.5, 0.5]
+    dataset.SliceThickness = 1
+    dataset.KVP = 120
+    dataset.RescaleIntercept = -1024
+    dataset.RescaleSlope = 1
+    return dataset
+
+
+def _item(**kwargs):
+    item = Dataset()
+    for keyword, value in kwargs.items():
+        setattr(item, keyword, value)
+    return item
+
+
+def enhanced_xa_dataset(frames):
+    """Return an enhanced multi-frame XA image with the given number of frames,
+    each with its own per-frame functional group item."""
+    dataset = Dataset()
+    _add_common_attributes(dataset, ENHANCED_XA_IMAGE_STORAGE, "XA")
+    _add_image_attributes(dataset, 16, 16, frames)
+    dataset.ImageType = ["ORIGINAL", "PRIMARY", "SINGLE PLANE"]
+    dataset.NumberOfFrames = frames
+    dataset.ContentDate = "20240101"
+    dataset.ContentTime = "120000"
+    dataset.ManufacturerModelName = "Synthetic"
+    dataset.DeviceSerialNumber = "1"
+    dataset.SoftwareVersions = "1.0"
+    dataset.AcquisitionContextSequence = Sequence()
+    dataset.CardiacSynchronizationTechnique = "NONE"
+    dataset.SharedFunctionalGroupsSequence = Sequence(
+        [
+            _item(
+                FrameAnatomySequence=Sequence(
+                    [
+                        _item(
+                            FrameLaterality="U",
+                            AnatomicRegionSequence=Sequence(
+                                [
+                                    _item(
+                                        CodeValue="41801008",
+                                        CodingSchemeDesignator="SCT",
+                                        CodeMeaning="Coronary artery",
+                                    )
+                                ]
+                            ),
+                        )
+                    ]
+                ),
+                IrradiationEventIdentificationSequence=Sequence(
+                    [
+                        _item(
+                            IrradiationEventUID=generate_uid(
+                                entropy_srcs=["irradiation event"]
+                            )
+                        )
+                    ]
+                ),
+                FramePixelDataPropertiesSequence=Sequence(
+                    [
+                        _item(
+                            FrameType=["ORIGINAL", "PRIMARY", "SINGLE PLANE"],
+                            ImagerPixelSpacing=[0.2, 0.2],
+                            PixelIntensityRelationship="LIN",
+                            PixelIntensityRelationshipSign=1,
+                            GeometricalProperties="UNIFORM",
+                            ImageProcessingApplied="NONE",
+                        )
+                    ]
+                ),
+                CollimatorShapeSequence=Sequence(
+                    [
+                        _item(
+                            CollimatorShape="RECTANGULAR",
+                            CollimatorLeftVerticalEdge=0,
+                            CollimatorRightVerticalEdge=15,
+                            CollimatorUpperHorizontalEdge=0,
+                            CollimatorLowerHorizontalEdge=15,
+                        )
+                    ]
+                ),
+            )
+        ]
+    )
+    dataset.PerFrameFunctionalGroupsSequence = Sequence(
+        [
+            _item(
+                FrameContentSequence=Sequence(
+                    [
+                        _item(
+                            FrameAcquisitionDateTime="20240101120000",
+                            FrameReferenceDateTime="20240101120000",
+                            FrameAcquisitionDuration=33,
+                        )
+                    ]
+                ),
+                FrameVOILUTSequence=Sequence(
+                    [_item(WindowCenter=2048 + index % 100, WindowWidth=4096)]
+                ),
+            )
+            for index in range(frames)
+        ]
+    )
+    return dataset
+
+
+def _content_items(depth, breadth):
+    items = Sequence()
+    for index in range(breadth):
+        item = _item(
+            RelationshipType="CONTAINS",
+            ConceptNameCodeSequence=Sequence(
+                [
+                    _item(
+                        CodeValue=str(depth * 10 + index),
+                        CodingSchemeDesignator="99TEST",
+                        CodeMeaning=f"Level {depth} item {index}",
+                    )
+                ]
+            ),
+        )
+        if depth > 1:
+            item.ValueType = "CONTAINER"
+            item.ContinuityOfContent = "SEPARATE"
+            item.ContentSequence = _content_items(depth - 1, breadth)
+        else:
+            item.ValueType = "TEXT"
+            item.TextValue = "Lorem ipsum"
+        items.append(item)
+    return items
+
+
+def deep_sequence_dataset(depth, breadth):
+    """Return a Basic Text SR document with a content tree of the given
+    depth, where each container has `breadth` children."""
+    dataset = Dataset()
+    _add_common_attributes(dataset, BASIC_TEXT_SR_STORAGE, "SR")
+    dataset.ContentDate = "20240101"
+    dataset.ContentTime = "120000"
+    dataset.ValueType = "CONTAINER"
+    dataset.ContinuityOfContent = "SEPARATE"
+    dataset.CompletionFlag = "COMPLETE"
+    dataset.VerificationFlag = "UNVERIFIED"
+    dataset.ConceptNameCodeSequence = Sequence(
+        [
+            _item(
+                CodeValue="0",
+                CodingSchemeDesignator="99TEST",
+                CodeMeaning="Document",
+            )
+        ]
+    )
+    dataset.ContentSequence = _content_items(depth, breadth)
+    return dataset
+
+
+def rtdose_dataset():
+    """Return the RT Dose dataset from the test fixtures."""
+    return dcmread(FIXTURE_PATH / "dicom" / "rtdose.dcm")
+
+
+def benchmark_datasets(dicom_info, frames=2000, depth=6, breadth=3):
+    datasets = {
+        "ct": ct_dataset(),
+        "enhanced_xa": enhanced_xa_dataset(frames),
+        "rtdose": rtdose_dataset(),
+    }
+    if BASIC_TEXT_SR_STORAGE in dicom_info.iods:
+        datasets["deep_sequence"] = deep_sequence_dataset(depth, breadth)
+    else:
+        print(
+            "Skipping deep_sequence: Basic Text SR is not in the DICOM information,"
+            " use --json-path with the JSON files of a full standard revision"
+        )
+    return datasets
+
+
+# optional attributes of modules contained in all benchmarked IODs,
+# used to create variants of a dataset with different structures
+OPTIONAL_ATTRIBUTES = {
+    "StudyDescription": "Benchmark",
+    "PhysiciansOfRecord": "Physician^Of^Record",
+    "NameOfPhysiciansReadingStudy": "Physician^Reading",
+    "ConsultingPhysicianName": "Physician^Consulting",
+    "InstitutionName": "Institution",
+    "InstitutionAddress": "Street 1",
+    "StationName": "Station",
+    "InstitutionalDepartmentName": "Department",
+    "PatientComments": "Comment",
+    "PatientBirthTime": "120000",
+}
+
+
+def write_variant(dataset, index, path):
+    """Write the dataset with the combination of optional attributes given
+    by the bits of `index`, so that variants with different indexes (up to
+    1024) have different structures."""
+    added = [
+        keyword
+        for bit, keyword in enumerate(OPTIONAL_ATTRIBUTES)
+        if index & (1 << bit) and keyword not in dataset
+    ]
+    for keyword in added:
+        setattr(dataset, keyword, OPTIONAL_ATTRIBUTES[keyword])
+    try:
+        write_dataset(dataset, path)
+    finally:
+        for keyword in added:
+            delattr(dataset, keyword)
+
+
+def write_dataset(dataset, path):
+    file_meta = FileMetaDataset()
+    file_meta.MediaStorageSOPClassUID = dataset.SOPClassUID
+    file_meta.MediaStorageSOPInstanceUID = dataset.SOPInstanceUID
+    file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+    file_dataset = FileDataset(path, dataset, file_meta=file_meta, preamble=b"\0" * 128)
+    file_dataset.is_little_endian = True
+    file_dataset.is_implicit_VR = False
+    dcmwrite(path, file_dataset, write_like_original=False)
+
+
+def percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
+
+
+# the result values for the latency of a file, None if not measured
+LATENCY_KEYS = ("mean_ms", "p50_ms", "p90_ms", "p99_ms")
+
+
+def timing_results(file_count, total_time, peak_memory, latencies):
+    results = {
+        "files_per_sec": file_count / total_time,
+        "peak_memory_kb": peak_memory / 1024,
+    }
+    results.update(dict.fromkeys(LATENCY_KEYS))
+    if latencies:
+        latencies = sorted(latencies)
+        results["mean_ms"] = statistics.mean(latencies) * 1000
+        results["p50_ms"] = percentile(latencies, 50) * 1000
+        results["p90_ms"] = percentile(latencies, 90) * 1000
+        results["p99_ms"] = percentile(latencies, 99) * 1000
+    return results
+
+
+class TimedFileValidator(DicomFileValidator):
+    """Records the validation time of each file validated in this process."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def validate_file(self, file_path):
+        start = time.perf_counter()
+        result = super().validate_file(file_path)
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+
+def peak_memory(func):
+    """Return the peak memory allocated while calling `func`.
+    This is measured separately from the timing, as tracing
+    the allocations has a large overhead."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_iod_validator(name, dataset, dicom_info, repeat):
+    def validate():
+        return IODValidator(dataset, dicom_info, logging.CRITICAL).validate()
+
+    # warm up, this also compiles the validation plan
+    check_result(name, validate())
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        file_start = time.perf_counter()
+        validate()
+        latencies.append(time.perf_counter() - file_start)
+    total_time = time.perf_counter() - start
+    return timing_results(repeat, total_time, peak_memory(validate), latencies)
+
+
+def benchmark_dir_validator(
+    name, dataset, dicom_info, repeat, jobs, reader, same_structure, structure_cache
+):
+    with tempfile.TemporaryDirectory() as dir_path:
+        paths = [str(Path(dir_path, f"{index:05}.dcm")) for index in range(repeat)]
+        for index, path in enumerate(paths):
+            if same_structure:
+                write_dataset(dataset, path)
+            else:
+                write_variant(dataset, index, path)
+
+        def new_validator():
+            return TimedFileValidator(
+                dicom_info,
+                logging.CRITICAL,
+                jobs=jobs,
+                reader=reader,
+                structure_cache=structure_cache,
+            )
+
+        # warm up, this also compiles the validation plan
+        check_result(name, new_validator().validate_file(paths[0])[paths[0]])
+
+        # a new validator is used for each measurement, so that no results
+        # of files with the same structure are reused from a previous run;
+        # the per-file latencies are only recorded if the files
+        # are validated in this process
+        validator = new_validator()
+        start = time.perf_counter()
+        results = validator.validate_dir(dir_path)
+        total_time = time.perf_counter() - start
+        for result in results.values():
+            check_result(name, result)
+        latencies = validator.latencies
+        validator = new_validator()
+        memory = peak_memory(lambda: validator.validate_dir(dir_path))
+    return timing_results(repeat, total_time, memory, latencies)
+
+
+def run_benchmarks(dicom_info, datasets, repeat, jobs, reader):
+    results = {}
+    for name, dataset in datasets.items():
+        print(f"Benchmarking {name}...")
+        results[f"iod/{name}"] = benchmark_iod_validator(
+            name, dataset, dicom_info, repeat
+        )
+        for kind, same_structure, structure_cache in (
+            ("dir", False, False),
+            ("series", True, False),
+            ("cached", True, True),
+        ):
+            results[f"{kind}/{name}"] = benchmark_dir_validator(
+                name,
+                dataset,
+                dicom_info,
+                repeat,
+                jobs,
+                reader,
+                same_structure,
+                structure_cache,
+            )
+    return results
+
+
+def print_results(results):
+    print(
+        f"{'benchmark':<24} {'files/s':>10} {'mean ms':>10} {'p50 ms':>10}"
+        f" {'p90 ms':>10} {'p99 ms':>10} {'peak KiB':>10}"
+    )
+    for name, result in results.items():
+        latencies = "".join(
+            f" {'-':>10}" if result[key] is None else f" {result[key]:>10.2f}"
+            for key in LATENCY_KEYS
+        )
+        print(
+            f"{name:<24} {result['files_per_sec']:>10.1f}{latencies}"
+            f" {result['peak_memory_kb']:>10.0f}"
+        )
+
+
+def regressions(results, baseline, tolerance):
+    """Return the benchmarks with a throughput, median or 99th percentile
+    latency, or peak memory that is worse than in the baseline by more
+    than the given tolerance."""
+    found = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["files_per_sec"] < base["files_per_sec"] * (1 - tolerance):
+            found.append(
+                f"{name}: {result['files_per_sec']:.1f} files/s"
+                f" (baseline: {base['files_per_sec']:.1f})"
+            )
+        for key, label in (("p50_ms", "p50"), ("p99_ms", "p99")):
+            if result.get(key) is None or base.get(key) is None:
+                continue
+            if result[key] > base[key] * (1 + tolerance):
+                found.append(
+                    f"{name}: {result[key]:.2f} ms {label} latency"
+                    f" (baseline: {base[key]:.2f})"
+                )
+        if result["peak_memory_kb"] > base["peak_memory_kb"] * (1 + tolerance):
+            found.append(
+                f"{name}: {result['peak_memory_kb']:.0f} KiB peak memory"
+                f" (baseline: {base['peak_memory_kb']:.0f})"
+            )
+    return found
+
+
+def structure_cache_regressions(results, tolerance):
+    """Return the datasets for which validating a series with the structure
+    cache is slower than without it by more than the given tolerance."""
+    found = []
+    for name, result in results.items():
+        if not name.startswith("cached/"):
+            continue
+        series_result = results[name.replace("cached/", "series/", 1)]
+        if result["files_per_sec"] < series_result["files_per_sec"] * (1 - tolerance):
+            found.append(
+                f"{name}: {result['files_per_sec']:.1f} files/s"
+                f" (without structure cache: {series_result['files_per_sec']:.1f})"
+            )
+    return found
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Measures the throughput of the DICOM validator"
+    )
+    parser.add_argument(
+        "--json-path",
+        help="Path of the JSON files with the DICOM information",
+        default=str(FIXTURE_PATH / "standard" / "2023c" / "json"),
+    )
+    parser.add_argument(
+        "--repeat",
+        "-n",
+        type=int,
+        help="Number of validations (and files) per dataset",
+        default=20,
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        help="Number of frames in the enhanced XA dataset",
+        default=2000,
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        help="Nesting depth of the content tree in the deep sequence dataset",
+        default=6,
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of processes used for the directory validation",
+        default=1,
+    )
+    parser.add_argument(
+        "--reader",
+        choices=READERS,
+        help="The way the files are read in the directory validation",
+        default="dcmread",
+    )
+    parser.add_argument(
+        "--output", "-o", help="Path of a JSON file to save the results to"
+    )
+    parser.add_argument(
+        "--baseline", "-b", help="Path of a JSON file with results to compare to"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        help="Relative deviation from the baseline regarded as regression",
+        default=0.2,
+    )
+    args = parser.parse_args(args)
+
+    dicom_info = EditionReader.load_dicom_info(Path(args.json_path))
+    datasets = benchmark_datasets(dicom_info, args.frames, args.depth)
+    try:
+        results = run_benchmarks(
+            dicom_info, datasets, args.repeat, args.jobs, args.reader
+        )
+    except BenchmarkError as e:
+        sys.exit(f"Benchmark failed - {e}")
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(results, f, indent=2)
+    found = structure_cache_regressions(results, args.tolerance)
+    if args.baseline:
+        with open(args.baseline, encoding="utf8") as f:
+            baseline = json.load(f)
+        found += regressions(results, baseline, args.tolerance)
+    for regression in found:
+        print(f"Regression in {regression}")
+    return len(found)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Helpers for cache files written with pickle.
+The caches are only used to speed up processing, so failing to read or
+write a cache file is not an error - the data is just created again.
+Cache files are tagged with the package version, so that data written
+by another version can be detected by the caller.
+"""
+
+import logging
+import os
+import pickle
+from pathlib import Path
+
+from dicom_validator import __version__
+
+# the exceptions that may be raised when unpickling invalid or outdated data
+UNPICKLING_ERRORS = (
+    pickle.UnpicklingError,
+    AttributeError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+    EOFError,
+)
+
+
+def pickled(data):
+    """Return the given data pickled with the highest protocol."""
+    return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def unpickled(data):
+    """Return the unpickled data, or None if the data cannot be unpickled."""
+    try:
+        return pickle.loads(data)
+    except UNPICKLING_ERRORS:
+        return None
+
+
+def read_cache_file(path):
+    """Read a cache file written by `write_cache_file`.
+
+    Parameters
+    ----------
+    path : str | Path
+        The path of the cache file.
+
+    Returns
+    -------
+    tuple[str, Any] | None
+        The package version that has written the file and the cached contents,
+        or None if the file does not exist or cannot be read.
+    """
+    try:
+        with open(path, "rb") as cache_file:
+            version, contents = pickle.load(cache_file)
+    except (OSError, *UNPICKLING_ERRORS):
+        return None
+    return version, contents
+
+
+def write_cache_file(path, contents):
+    """Write the given contents together with the package version into
+    a cache file. The file is replaced atomically, so that concurrent
+    readers never see a partially written file.
+
+    Parameters
+    ----------
+    path : str | Path
+        The path of the cache file.
+    contents : Any
+        The data to cache, which must be picklable.
+
+    Returns
+    -------
+    bool
+        True if the file has been written.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as cache_file:
+            pickle.dump(
+                (__version__, contents), cache_file, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        logging.getLogger().debug("Failed to write %s: %s", path, e)
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return False
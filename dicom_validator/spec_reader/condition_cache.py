@@ -0,0 +1,85 @@
+"""
+Persistent cache of parsed conditions, shared by all DICOM revisions
+in the same standard path.
+Most condition texts in PS3.3 do not change between editions, so the
+parsed conditions can be reused when creating the JSON files for another
+revision. As the result of parsing a condition also depends on the data
+dictionary, each parsed condition is stored together with the dictionary
+entries used for parsing it, and only reused if these are unchanged.
+"""
+
+from pathlib import Path
+
+from dicom_validator import __version__
+from dicom_validator.pickle_cache import pickled, read_cache_file, write_cache_file
+
+
+class SpecCache:
+    """Base class for caches used to create the JSON files,
+    saved as a versioned pickle file.
+
+    Parameters
+    ----------
+    path : str | Path
+        The path of the cache file. If it does not exist, or has been
+        written by another package version, the cache starts empty.
+    source_path : str | Path | None
+        The path of the cache file to read the entries from, if different
+        from `path` (e.g. the cache of a previous edition).
+    """
+
+    def __init__(self, path, source_path=None):
+        self.path = Path(path)
+        self._changed = False
+        self._entries = self._load(source_path or self.path)
+
+    @staticmethod
+    def _load(path):
+        cached = read_cache_file(path)
+        # the parsing results may change with any other package version
+        if cached is None or cached[0] != __version__:
+            return {}
+        return cached[1]
+
+    def _contents(self):
+        return self._entries
+
+    def save(self):
+        """Write the cache file if the cache has been changed."""
+        if self._changed and write_cache_file(self.path, self._contents()):
+            self._changed = False
+
+
+class ConditionCache(SpecCache):
+    """Cache of parsed conditions by condition text, shared by all DICOM
+    revisions in the same standard path."""
+
+    def entries(self, condition_str):
+        """Return the cached entries for the given condition text.
+
+        Returns
+        -------
+        list[tuple[tuple, bytes]]
+            The dictionary lookups made while parsing the condition, and
+            the pickled condition. The lookups are given as sorted
+            tuple of ``((kind, key), value)`` items, as recorded
+            by the `ConditionParser`.
+        """
+        return self._entries.get(condition_str, [])
+
+    def add(self, condition_str, dependencies, condition):
+        """Add a parsed condition to the cache.
+
+        Parameters
+        ----------
+        condition_str : str
+            The condition text as found in the standard.
+        dependencies : tuple
+            The dictionary lookups made while parsing the condition.
+        condition : Condition
+            The parsed condition.
+        """
+        self._entries.setdefault(condition_str, []).append(
+            (dependencies, pickled(condition))
+        )
+        self._changed = True
@@ -1,6 +1,8 @@
+import pickle
 import re
 from collections import OrderedDict
-from typing import Dict, Tuple, Optional, List
+from contextlib import contextmanager
+from typing import Any, Dict, Tuple, Optional, List, Iterable, Iterator
 
 from dicom_validator.spec_reader.condition import (
     Condition,
@@ -8,6 +10,7 @@ from dicom_validator.spec_reader.condition import (
     ConditionOperator,
     ValuesType,
 )
+from dicom_validator.spec_reader.condition_cache import ConditionCache
 
 
 class ConditionParser:
@@ -80,19 +83,93 @@ class ConditionParser:
         ]
     )
 
-    def __init__(self, dict_info: Dict) -> None:
+    # all operators in a single expression - for operators starting at the
+    # same position, the first listed operator is matched
+    operator_expression = re.compile(
+        "|".join(re.escape(operator) for operator in operators)
+    )
+    logical_op_expression = re.compile(
+        "({}) ".format("|".join(re.escape(operator) for operator in logical_ops))
+    )
+
+    def __init__(self, dict_info: Dict, cache: Optional[ConditionCache] = None) -> None:
         self._dict_info = dict_info
-        self._uid_dict_info = {}
+        self._cache = cache
+        # the dictionary lookups made while parsing, if recorded
+        self._dependencies: Optional[Dict[Tuple[str, str], Any]] = None
+        # tag names mapped to the first tag ID with that name; UID tags can
+        # also be referenced without the "UID" suffix, if no other tag
+        # has that name
+        self._tag_ids_by_name: Dict[str, str] = {}
+        for tag, info in dict_info.items():
+            self._tag_ids_by_name.setdefault(info["name"], tag)
         for tag, info in dict_info.items():
             if info["name"].endswith(" UID"):
-                uid_info = info.copy()
-                uid_info["name"] = uid_info["name"][:-4]
-                self._uid_dict_info[tag] = uid_info
+                self._tag_ids_by_name.setdefault(info["name"][:-4], tag)
 
     def parse(self, condition_str: str) -> Condition:
         """Parse the given condition string and return a Condition object
         with the required attributes.
+        If a condition cache is used, a cached condition parsed with the same
+        dictionary entries is returned instead, and newly parsed conditions
+        are added to the cache.
+        """
+        if self._cache is None:
+            return self._parse(condition_str)
+        for dependencies, condition in self._cache.entries(condition_str):
+            if self.lookups_match(dependencies):
+                self.record_lookups(dependencies)
+                return pickle.loads(condition)
+        with self.recorded_lookups() as dependencies:
+            result = self._parse(condition_str)
+        self._cache.add(condition_str, tuple(sorted(dependencies.items())), result)
+        return result
+
+    def lookup(self, kind: str, key: str) -> Any:
+        """Return the tag ID for a tag name (kind "name"), or the name and VR
+        for a tag ID (kind "tag"), or None if not found.
+        The lookup is recorded if inside `recorded_lookups`.
         """
+        value = self._lookup_value(kind, key)
+        if self._dependencies is not None:
+            self._dependencies[(kind, key)] = value
+        return value
+
+    def lookups_match(self, lookups: Iterable[Tuple[Tuple[str, str], Any]]) -> bool:
+        """Return True if all given recorded lookups give the same result
+        with the current dictionary."""
+        return all(
+            self._lookup_value(kind, key) == value for (kind, key), value in lookups
+        )
+
+    def record_lookups(self, lookups: Iterable[Tuple[Tuple[str, str], Any]]) -> None:
+        """Add the given lookups to the current recording, if any.
+        Used if a cached result is reused instead of parsing again."""
+        if self._dependencies is not None:
+            self._dependencies.update(lookups)
+
+    @contextmanager
+    def recorded_lookups(self) -> Iterator[Dict[Tuple[str, str], Any]]:
+        """Context manager recording all dictionary lookups made inside the
+        context in the returned dict. Recordings can be nested - the lookups
+        are also recorded in the enclosing recording.
+        """
+        outer = self._dependencies
+        self._dependencies = {}
+        try:
+            yield self._dependencies
+        finally:
+            if outer is not None:
+                outer.update(self._dependencies)
+            self._dependencies = outer
+
+    def _lookup_value(self, kind: str, key: str) -> Any:
+        if kind == "name":
+            return self._tag_ids_by_name.get(key)
+        entry = self._dict_info.get(key)
+        return (entry["name"], entry["vr"]) if entry else None
+
+    def _parse(self, condition_str: str) -> Condition:
         condition_prefixes = (
             "required if ",
             "shall be present if ",
@@ -120,15 +197,21 @@ class ConditionParser:
         return Condition(ctype=ConditionType.UserDefined)
 
     def _parse_tag_expression(self, condition: str) -> Tuple[Condition, Optional[str]]:
-        operator_text = None
-        op_offset = None
-        for operator in self.operators:
-            offset = condition.find(operator)
-            if offset > 0 and (op_offset is None or offset < op_offset):
-                op_offset = offset
-                operator_text = operator
-        if operator_text is None or op_offset is None:
+        operator_expression = self.operator_expression
+        if condition.startswith(" "):
+            # operators at the start of the condition are ignored completely
+            operator_expression = re.compile(
+                "|".join(
+                    re.escape(operator)
+                    for operator in self.operators
+                    if not condition.startswith(operator)
+                )
+            )
+        match = operator_expression.search(condition, 1)
+        if match is None:
             return Condition(ctype=ConditionType.UserDefined), None
+        operator_text = match.group()
+        op_offset = match.start()
         operator = self.operators[operator_text]
         rest = condition[op_offset + len(operator_text) :]
         if operator in (
@@ -170,14 +253,10 @@ class ConditionParser:
             else ConditionType.MandatoryOrUserDefined
         )
         # special handling for AT tags - values are saved as numbers
-        if (
-            result.tag
-            and result.values
-            and operator == ConditionOperator.EqualsValue
-            and result.tag in self._dict_info
-            and self._dict_info[result.tag]["vr"] == "AT"
-        ):
-            result.values = [self._tag_id(str(v)) for v in result.values]
+        if result.tag and result.values and operator == ConditionOperator.EqualsValue:
+            tag_entry = self.lookup("tag", result.tag)
+            if tag_entry and tag_entry[1] == "AT":
+                result.values = [self._tag_id(str(v)) for v in result.values]
         return result, rest
 
     def _get_other_condition(self, condition_string: str) -> Optional[Condition]:
@@ -201,19 +280,13 @@ class ConditionParser:
 
         if not tag_id:
             # tag name only - look it up
-            for tag_id, entry in self._dict_info.items():
-                if entry["name"] == tag_name:
-                    return tag_id
-            for tag_id, entry in self._uid_dict_info.items():
-                if entry["name"] == tag_name:
-                    return tag_id
-            return None
+            return self.lookup("name", tag_name)
 
         # we have both tag name and ID
-        id_entry = self._dict_info.get(tag_id)
+        id_entry = self.lookup("tag", tag_id)
         if not id_entry:
             return None
-        name_from_id = id_entry["name"]
+        name_from_id = id_entry[0]
         if name_from_id == tag_name:
             # tag name matched tag ID
             return tag_id
@@ -372,11 +445,10 @@ class ConditionParser:
             if rest.startswith(", "):
                 rest = rest[2:]
             logical_op = None
-            for operator in self.logical_ops:
-                if rest.startswith(operator + " "):
-                    logical_op = self.logical_ops[operator]
-                    condition = rest[len(operator) + 1 :]
-                    break
+            match = self.logical_op_expression.match(rest)
+            if match is not None:
+                logical_op = self.logical_ops[match.group(1)]
+                condition = rest[match.end() :]
             if logical_op is not None:
                 next_result = self._parse_tag_expressions(condition, nested=True)
                 if next_result.type != ConditionType.UserDefined:
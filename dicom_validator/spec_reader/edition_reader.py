@@ -1,18 +1,24 @@
 import datetime
+import hashlib
 import html.parser as html_parser
 import json
 import logging
 import re
 import sys
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.request import urlretrieve
 
 from dicom_validator import __version__
+from dicom_validator.pickle_cache import read_cache_file, write_cache_file
+from dicom_validator.spec_reader.condition_cache import ConditionCache
+from dicom_validator.spec_reader.section_cache import SectionCache
 from dicom_validator.spec_reader.part3_reader import Part3Reader
 from dicom_validator.spec_reader.part4_reader import Part4Reader
 from dicom_validator.spec_reader.part6_reader import Part6Reader
 from dicom_validator.spec_reader.serializer import DefinitionEncoder
+from dicom_validator.spec_reader.spec_reader import SpecReader
 from dicom_validator.validator.iod_validator import DicomInfo
 
 
@@ -45,6 +51,9 @@ class EditionReader:
     module_info_json = "module_info.json"
     dict_info_json = "dict_info.json"
     uid_info_json = "uid_info.json"
+    dicom_info_cache = "dicom_info.pickle"
+    condition_cache = "conditions.pickle"
+    section_cache = "sections.pickle"
 
     def __init__(self, path):
         self.path = Path(path)
@@ -168,12 +177,91 @@ class EditionReader:
 
     @classmethod
     def load_dicom_info(cls, json_path):
+        """Return the DICOM information from the given JSON path.
+        The information is read from the binary cache if it is valid,
+        otherwise from the JSON files. The cache is not written here,
+        but together with the JSON files (see `get_revision`).
+        """
+        json_path = Path(json_path)
+        dicom_info = cls.load_dicom_info_cache(json_path)
+        if dicom_info is None:
+            dicom_info = cls.load_dicom_info_json(json_path)
+        return dicom_info
+
+    @classmethod
+    def load_dicom_info_json(cls, json_path):
+        """Return the DICOM information read from the JSON files in the given path."""
         return DicomInfo(
             cls.load_info(json_path, cls.dict_info_json),
             cls.load_info(json_path, cls.iod_info_json),
             cls.load_info(json_path, cls.module_info_json),
         )
 
+    @classmethod
+    def dicom_info_cache_outdated(cls, json_path):
+        """Return True if the binary cache in the given path does not exist,
+        or is older than any of the related JSON files.
+        """
+        try:
+            cache_time = (json_path / cls.dicom_info_cache).stat().st_mtime
+            return any(
+                (json_path / info_json).stat().st_mtime > cache_time
+                for info_json in (
+                    cls.dict_info_json,
+                    cls.iod_info_json,
+                    cls.module_info_json,
+                )
+            )
+        except OSError:
+            return True
+
+    @classmethod
+    def load_dicom_info_cache(cls, json_path):
+        """Return the DICOM information from the binary cache in the given path,
+        or None if the cache does not exist or is outdated.
+        """
+        if cls.dicom_info_cache_outdated(json_path):
+            return None
+        cached = read_cache_file(json_path / cls.dicom_info_cache)
+        if cached is None or cached[0] < __version__:
+            return None
+        try:
+            dictionary, iods, modules = cached[1]
+        except (TypeError, ValueError):
+            return None
+        return DicomInfo(dictionary, iods, modules)
+
+    @classmethod
+    def write_dicom_info_cache(cls, json_path, dicom_info):
+        """Write the DICOM information into a binary cache in the given path.
+        The cache is versioned like the JSON files, and ignored if any
+        of the related JSON files is newer.
+        """
+        write_cache_file(
+            json_path / cls.dicom_info_cache,
+            (dicom_info.dictionary, dicom_info.iods, dicom_info.modules),
+        )
+
+    @classmethod
+    def spec_fingerprint(cls, json_path):
+        """Return a hash of the JSON files used for validation in the given path.
+        The hash changes if the JSON files are recreated with different contents,
+        e.g. by a newer version of the spec reader.
+        """
+        spec_hash = hashlib.sha256()
+        for filename in (
+            "version",
+            cls.dict_info_json,
+            cls.iod_info_json,
+            cls.module_info_json,
+        ):
+            try:
+                spec_hash.update((json_path / filename).read_bytes())
+            except OSError:
+                pass
+            spec_hash.update(b"\0")
+        return spec_hash.hexdigest()
+
     @classmethod
     def json_files_exist(cls, json_path):
         for filename in (
@@ -190,28 +278,79 @@ class EditionReader:
     def dump_description(cls, description):
         return json.dumps(description, sort_keys=True, indent=2, cls=DefinitionEncoder)
 
+    @classmethod
+    def previous_section_cache(cls, json_path):
+        """Return the path of the section cache to use for creating the JSON
+        files in the given path: the cache of the same revision if it exists,
+        or else the most recently written cache of another revision.
+        """
+        cache_path = json_path / cls.section_cache
+        if cache_path.exists():
+            return cache_path
+        other_paths = [
+            path
+            for path in json_path.parent.parent.glob(f"*/json/{cls.section_cache}")
+            if path != cache_path
+        ]
+        if other_paths:
+            return max(other_paths, key=lambda path: path.stat().st_mtime)
+
     @classmethod
     def create_json_files(cls, docbook_path, json_path):
         print("Creating JSON excerpts from docbook files...")
-        part6reader = Part6Reader(docbook_path)
-        dict_info = part6reader.data_elements()
-        part3reader = Part3Reader(docbook_path, dict_info)
-        part4reader = Part4Reader(docbook_path)
+        # PS3.3 is parsed in the background while the registry tables
+        # are streamed from PS3.6 and PS3.4
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            part3_tree = executor.submit(SpecReader.parse_doc_tree, docbook_path, 3)
+            part6reader = Part6Reader(docbook_path)
+            dict_info = part6reader.data_elements()
+            uid_info = part6reader.all_uids()
+            chapter_info = Part4Reader(docbook_path).iod_chapters()
+            # the parsed conditions are shared by all revisions
+            # in the standard path
+            condition_cache = ConditionCache(
+                Path(docbook_path).parent.parent / cls.condition_cache
+            )
+            # unchanged sections are taken over from the previous build
+            section_cache = SectionCache(
+                json_path / cls.section_cache,
+                cls.previous_section_cache(json_path),
+            )
+            part3reader = Part3Reader(
+                docbook_path,
+                dict_info,
+                {3: part3_tree.result()},
+                condition_cache,
+                section_cache,
+            )
         iod_info = part3reader.iod_descriptions()
-        chapter_info = part4reader.iod_chapters()
+        module_info = part3reader.module_descriptions()
+        condition_cache.save()
+        section_cache.save()
+        # release the PS3.3 document tree
+        del part3reader
         definition = {}
         for chapter in iod_info:
             if chapter in chapter_info:
                 for uid in chapter_info[chapter]:
                     definition[uid] = iod_info[chapter]
-        with open(json_path / cls.iod_info_json, "w", encoding="utf8") as info_file:
-            info_file.write(cls.dump_description(definition))
-        with open(json_path / cls.module_info_json, "w", encoding="utf8") as info_file:
-            info_file.write(cls.dump_description(part3reader.module_descriptions()))
-        with open(json_path / cls.dict_info_json, "w", encoding="utf8") as info_file:
-            info_file.write(cls.dump_description(dict_info))
-        with open(json_path / cls.uid_info_json, "w", encoding="utf8") as info_file:
-            info_file.write(cls.dump_description(part6reader.all_uids()))
+        descriptions = {
+            cls.iod_info_json: cls.dump_description(definition),
+            cls.module_info_json: cls.dump_description(module_info),
+            cls.dict_info_json: cls.dump_description(dict_info),
+            cls.uid_info_json: cls.dump_description(uid_info),
+        }
+        for info_json, description in descriptions.items():
+            with open(json_path / info_json, "w", encoding="utf8") as info_file:
+                info_file.write(description)
+        cls.write_dicom_info_cache(
+            json_path,
+            DicomInfo(
+                json.loads(descriptions[cls.dict_info_json]),
+                json.loads(descriptions[cls.iod_info_json]),
+                json.loads(descriptions[cls.module_info_json]),
+            ),
+        )
         cls.write_current_version(json_path)
         print("Done!")
 
@@ -242,6 +381,9 @@ class EditionReader:
             or recreate_json
         ):
             self.create_json_files(docbook_path, json_path)
+        elif create_json and self.dicom_info_cache_outdated(json_path):
+            # JSON files created without the binary cache
+            self.write_dicom_info_cache(json_path, self.load_dicom_info_json(json_path))
         print(f"Using DICOM revision {revision}")
         return destination
 
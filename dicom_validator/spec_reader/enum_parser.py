@@ -87,9 +87,11 @@ class EnumParser:
         for xref in node.findall(f"{self.docbook_ns}para/{self.docbook_ns}xref"):
             link = xref.attrib.get("linkend")
             if link and link.startswith("sect_"):
+                # the section is always looked up, even if the enums
+                # are cached, so that the lookup can be tracked
+                section = self._find_section(link[5:])
                 if link in self._enum_cache:
                     return self._enum_cache[link]
-                section = self._find_section(link[5:])
                 if section is not None:
                     var_list = section.find(f"{self.docbook_ns}variablelist")
                     if var_list is not None:
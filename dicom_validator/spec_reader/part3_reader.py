@@ -4,7 +4,10 @@ for specific Storage SOP Classes.
 The information is taken from PS3.3 in docbook format as provided by ACR NEMA.
 """
 
+import hashlib
 import logging
+import pickle
+from contextlib import contextmanager
 from itertools import groupby
 
 import sys
@@ -22,10 +25,21 @@ from dicom_validator.spec_reader.spec_reader import (
 class Part3Reader(SpecReader):
     """Reads information from PS3.3 in docbook format."""
 
-    def __init__(self, spec_dir, dict_info):
-        super(Part3Reader, self).__init__(spec_dir)
+    def __init__(
+        self,
+        spec_dir,
+        dict_info,
+        doc_trees=None,
+        condition_cache=None,
+        section_cache=None,
+    ):
+        super(Part3Reader, self).__init__(spec_dir, doc_trees)
         self.part_nr = 3
         self._dict_info = dict_info
+        self._section_cache = section_cache
+        # labeled nodes looked up while parsing a description, if recorded
+        self._node_lookups = None
+        self._node_hashes = {}
         self._iod_descriptions = {}
         self._iod_nodes = {}
         self._module_descriptions = {}
@@ -33,11 +47,17 @@ class Part3Reader(SpecReader):
         self.logger = logging.getLogger()
         if not self.logger.hasHandlers():
             self.logger.addHandler(logging.StreamHandler(sys.stdout))
-        self._condition_parser = ConditionParser(self._dict_info)
+        self._condition_parser = ConditionParser(self._dict_info, condition_cache)
         self._enum_parser = EnumParser(self.find_section)
 
     def find_section(self, name):
-        return self.get_doc_root().find(f".//{self.docbook_ns}section[@label='{name}']")
+        return self._find_labeled("section", name)
+
+    def _find_labeled(self, element, label):
+        node = super()._find_labeled(element, label)
+        if self._node_lookups is not None:
+            self._node_lookups[(element, label)] = node
+        return node
 
     def iod_description(self, chapter):
         """Return the IOD information for the given chapter.
@@ -55,7 +75,24 @@ class Part3Reader(SpecReader):
         if chapter not in self._iod_descriptions:
             iod_node = self._get_iod_nodes().get(chapter)
             if iod_node is not None and len(iod_node) > 0:
-                description = self._parse_iod_node(iod_node)
+                descriptions = self._cached_descriptions("iod", chapter)
+                if descriptions is not None:
+                    description = descriptions[chapter]
+                    # make sure the referenced descriptions are loaded
+                    for modules in (
+                        description["modules"],
+                        description["group_macros"],
+                    ):
+                        for module in modules.values():
+                            if "ref" in module:
+                                self.module_description(module["ref"])
+                else:
+                    with self._recorded_lookups() as lookups:
+                        self._node_lookups[("section", chapter)] = iod_node
+                        description = self._parse_iod_node(iod_node)
+                    self._cache_descriptions(
+                        "iod", chapter, lookups, {chapter: description}
+                    )
                 self._iod_descriptions[chapter] = description
         try:
             return self._iod_descriptions[chapter]
@@ -91,10 +128,31 @@ class Part3Reader(SpecReader):
         Raises SpecReaderLookupError if the section is not found.
         """
         if section not in self._module_descriptions:
-            section_node = self._get_section_node(section)
-            if section_node is not None:
-                description = self._parse_module_description(section_node)
-                self._module_descriptions[section] = description
+            descriptions = self._cached_descriptions("module", section)
+            if descriptions is not None:
+                for label, description in descriptions.items():
+                    if label != section:
+                        self._module_descriptions.setdefault(label, description)
+                self._module_descriptions[section] = descriptions[section]
+            else:
+                known_sections = set(self._module_descriptions)
+                with self._recorded_lookups() as lookups:
+                    section_node = self._get_section_node(section)
+                    if section_node is not None:
+                        description = self._parse_module_description(section_node)
+                        self._module_descriptions[section] = description
+                if section_node is not None:
+                    # includes the descriptions of newly parsed included sections
+                    self._cache_descriptions(
+                        "module",
+                        section,
+                        lookups,
+                        {
+                            label: description
+                            for label, description in self._module_descriptions.items()
+                            if label not in known_sections
+                        },
+                    )
         try:
             return self._module_descriptions[section]
         except KeyError:
@@ -111,9 +169,76 @@ class Part3Reader(SpecReader):
         self.iod_descriptions()
         return self._module_descriptions
 
+    @contextmanager
+    def _recorded_lookups(self):
+        """Record the labeled nodes and dictionary entries looked up inside
+        the context. The recordings can be nested - the lookups are
+        also recorded in the enclosing recording.
+        Yields a tuple of the node lookups and dictionary lookups dicts.
+        """
+        outer = self._node_lookups
+        self._node_lookups = {}
+        try:
+            with self._condition_parser.recorded_lookups() as dict_lookups:
+                yield self._node_lookups, dict_lookups
+        finally:
+            if outer is not None:
+                outer.update(self._node_lookups)
+            self._node_lookups = outer
+
+    def _node_hash(self, key, node):
+        if key not in self._node_hashes:
+            self._node_hashes[key] = (
+                None
+                if node is None
+                else hashlib.sha256(self._serialized(node)).hexdigest()
+            )
+        return self._node_hashes[key]
+
+    def _cached_descriptions(self, kind, label):
+        """Return the cached descriptions for the given section,
+        if all sections and dictionary entries looked up while parsing
+        it are unchanged, or None otherwise."""
+        if self._section_cache is None:
+            return None
+        entry = self._section_cache.get(kind, label)
+        if entry is None:
+            return None
+        node_lookups, dict_lookups, descriptions = entry
+        for key, node_hash in node_lookups:
+            if self._node_hash(key, super()._find_labeled(*key)) != node_hash:
+                return None
+        if not self._condition_parser.lookups_match(dict_lookups):
+            return None
+        self._section_cache.use(kind, label, entry)
+        if self._node_lookups is not None:
+            for key, _ in node_lookups:
+                self._node_lookups[key] = super()._find_labeled(*key)
+        self._condition_parser.record_lookups(dict_lookups)
+        return pickle.loads(descriptions)
+
+    def _cache_descriptions(self, kind, label, lookups, descriptions):
+        if self._section_cache is None:
+            return
+        node_lookups, dict_lookups = lookups
+        self._section_cache.use(
+            kind,
+            label,
+            (
+                tuple(
+                    sorted(
+                        (key, self._node_hash(key, node))
+                        for key, node in node_lookups.items()
+                    )
+                ),
+                tuple(sorted(dict_lookups.items())),
+                pickle.dumps(descriptions, protocol=pickle.HIGHEST_PROTOCOL),
+            ),
+        )
+
     def _get_iod_nodes(self):
         if not self._iod_nodes:
-            chapter_a = self._find(self.get_doc_root(), ['chapter[@label="A"]'])
+            chapter_a = self._find_labeled("chapter", "A")
             if chapter_a is None:
                 raise SpecReaderParseError("Chapter A in Part 3 not found")
             # ignore A.1
@@ -141,22 +266,12 @@ class Part3Reader(SpecReader):
         return self._iod_nodes
 
     def _get_section_node(self, section):
-        section_parts = section.split(".")
-        section_name = section_parts[0]
-        search_path = [f'chapter[@label="{section_name}"]']
-        for section_part in section_parts[1:]:
-            section_name = section_name + "." + section_part
-            search_path.append(f'section[@label="{section_name}"]')
-        section_node = self._find(self.get_doc_root(), search_path)
-        # handle incorrect nesting in specific section
-        if (
-            section_node is None
-            and section_parts[:-1] == ["C", "8", "31"]
-            and int(section_parts[-1]) > 6
-        ):
-            search_path.insert(-1, 'section[@label="C.8.31.6"]')
-            section_node = self._find(self.get_doc_root(), search_path)
-        return section_node
+        # section labels are unique, so the nesting of the section does not
+        # have to be checked (this also handles the incorrect nesting of the
+        # sections following C.8.31.6)
+        if "." not in section:
+            return self._find_labeled("chapter", section)
+        return self._find_labeled("section", section)
 
     def _parse_iod_node(self, iod_node):
         return {
@@ -255,9 +370,9 @@ class Part3Reader(SpecReader):
                 current_descriptions[-1][tag_id]["cond"] = self._condition_parser.parse(
                     self._find_all_text(columns[3])
                 )
-            info = self._dict_info.get(tag_id)
+            info = self._condition_parser.lookup("tag", tag_id)
             if info:
-                enum_values = self._enum_parser.parse(columns[3], info["vr"])
+                enum_values = self._enum_parser.parse(columns[3], info[1])
                 if enum_values:
                     current_descriptions[-1][tag_id]["enums"] = enum_values
 
@@ -265,9 +380,7 @@ class Part3Reader(SpecReader):
         return last_tag_id
 
     def _get_ref_node(self, element, label):
-        return self._get_doc_tree().find(
-            f'.//{self.docbook_ns}{element}[@label="{label}"]'
-        )
+        return self._find_labeled(element, label)
 
     @staticmethod
     def _get_ref_element_and_label(ref):
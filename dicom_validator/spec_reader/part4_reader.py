@@ -38,14 +38,7 @@ class Part4Reader(SpecReader):
         return self._chapters
 
     def _read_sop_table(self, chapter):
-        table = self._find(
-            self.get_doc_root(),
-            ['chapter[@label="B"]', f'section[@label="{chapter}"]', "table", "tbody"],
-        )
-        if table is None:
-            raise SpecReaderParseError("SOP Class table in Part 4 not found")
-        row_nodes = self._findall(table, ["tr"])
-        for row_node in row_nodes:
+        for _, row_node in self._iter_table_rows([("section", chapter)]):
             column_nodes = self._findall(row_node, ["td"])
             if len(column_nodes) in (3, 4):
                 # columns are SOP Class Name, SOP Class UID, IOD Specification
@@ -56,6 +49,8 @@ class Part4Reader(SpecReader):
                     chapter = target_node.attrib["targetptr"].split("_")[1]
                     self._sop_class_uids[uid] = chapter
                     self._chapters.setdefault(chapter, []).append(uid)
+        if not self._sop_class_uids:
+            raise SpecReaderParseError("SOP Class table in Part 4 not found")
         self._patch_incorrect_values()
 
     def _patch_incorrect_values(self):
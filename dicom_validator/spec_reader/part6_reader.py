@@ -24,7 +24,7 @@ class Part6Reader(SpecReader):
         See data_element() for the contained value.
         """
         if self._data_elements is None:
-            self._read_element_table()
+            self._read_registry_tables()
         return self._data_elements
 
     def data_element(self, tag_id):
@@ -42,32 +42,58 @@ class Part6Reader(SpecReader):
         """
         return self.data_elements().get(tag_id)
 
-    def _read_element_table(self):
+    def _read_registry_tables(self):
+        # both registries are read in a single pass over the streamed document
         self._data_elements = {}
-        table = self._find(
-            self.get_doc_root(), ['chapter[@label="6"]', "table", "tbody"]
-        )
-        if table is None:
+        self._uids = {}
+        for container, row_node in self._iter_table_rows(
+            [("chapter", "6"), ("chapter", "A")]
+        ):
+            if container == ("chapter", "6"):
+                self._read_element_row(row_node)
+            else:
+                self._read_uid_row(row_node)
+        if not self._data_elements:
             raise SpecReaderParseError(
                 "Registry of DICOM Data Elements not found in PS3.6"
             )
-        row_nodes = self._findall(table, ["tr"])
-        attrib_indexes = [1, 3, 4, 5]
-        for row_node in row_nodes:
-            column_nodes = self._findall(row_node, ["td"])
-            if len(column_nodes) == 6:
-                tag_id = self._find_text(column_nodes[0])
-                if tag_id:
-                    tag_attributes = [
-                        self._find_text(column_nodes[i]) for i in attrib_indexes
-                    ]
-                    if tag_attributes is not None:
-                        self._data_elements[tag_id] = {
-                            "name": tag_attributes[0],
-                            "vr": tag_attributes[1],
-                            "vm": tag_attributes[2],
-                            "prop": tag_attributes[3],
-                        }
+        if not self._uids:
+            raise SpecReaderParseError(
+                "Registry of DICOM Unique Identifiers not found in PS3.6"
+            )
+
+    def _read_element_row(self, row_node):
+        column_nodes = self._findall(row_node, ["td"])
+        if len(column_nodes) == 6:
+            tag_id = self._find_text(column_nodes[0])
+            if tag_id:
+                tag_attributes = [
+                    self._find_text(column_nodes[i]) for i in (1, 3, 4, 5)
+                ]
+                self._data_elements[tag_id] = {
+                    "name": tag_attributes[0],
+                    "vr": tag_attributes[1],
+                    "vm": tag_attributes[2],
+                    "prop": tag_attributes[3],
+                }
+
+    def _read_uid_row(self, row_node):
+        column_nodes = self._findall(row_node, ["td"])
+        nr_columns = len(column_nodes)
+        if nr_columns in (4, 5):
+            # columns are UID Value, UID Name, UID Keyword (only
+            # since 2020d), UID Type and Part
+            uid_attributes = [
+                self._find_text(column_nodes[i]) for i in range(nr_columns - 1)
+            ]
+            uid_type = uid_attributes[nr_columns - 2]
+            # in PS3.6 xml there are multiple zero width (U+200B)
+            # spaces inside the UIDs
+            # we remove them hoping this is the only such problem
+            uid_value = self.cleaned_value(uid_attributes[0])
+            self._uids.setdefault(uid_type, {})[uid_value] = self.cleaned_value(
+                uid_attributes[1]
+            )
 
     def uids(self, uid_type):
         """Return a dict of UID values (keys) and names for the given UID type."""
@@ -95,32 +121,5 @@ class Part6Reader(SpecReader):
 
     def _get_uids(self):
         if self._uids is None:
-            self._uids = {}
-            table = self._find(
-                self.get_doc_root(), ['chapter[@label="A"]', "table", "tbody"]
-            )
-            if table is None:
-                raise SpecReaderParseError(
-                    "Registry of DICOM Unique Identifiers not found in PS3.6"
-                )
-
-            row_nodes = self._findall(table, ["tr"])
-            for row_node in row_nodes:
-                column_nodes = self._findall(row_node, ["td"])
-                nr_columns = len(column_nodes)
-                if nr_columns in (4, 5):
-                    # columns are UID Value, UID Name, UID Keyword (only
-                    # since 2020d), UID Type and Part
-                    uid_attributes = [
-                        self._find_text(column_nodes[i]) for i in range(nr_columns - 1)
-                    ]
-                    if uid_attributes is not None:
-                        uid_type = uid_attributes[nr_columns - 2]
-                        # in PS3.6 xml there are multiple zero width (U+200B)
-                        # spaces inside the UIDs
-                        # we remove them hoping this is the only such problem
-                        uid_value = self.cleaned_value(uid_attributes[0])
-                        self._uids.setdefault(uid_type, {})[uid_value] = (
-                            self.cleaned_value(uid_attributes[1])
-                        )
+            self._read_registry_tables()
         return self._uids
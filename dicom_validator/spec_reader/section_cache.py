@@ -0,0 +1,50 @@
+"""
+Persistent cache of the module and IOD descriptions parsed from PS3.3.
+Most of PS3.3 does not change between editions, so the descriptions can
+be reused from a previous build. As parsing also depends on the data
+dictionary and on other sections referenced in the parsed section, the
+descriptions are stored together with the used dictionary entries and
+section contents, and only reused if these are unchanged.
+"""
+
+from dicom_validator.spec_reader.condition_cache import SpecCache
+
+
+class SectionCache(SpecCache):
+    """Cache of the module and IOD descriptions parsed from PS3.3 sections,
+    saved together with the JSON files of a revision.
+    Only the entries used in the current build are saved.
+    """
+
+    def __init__(self, path, source_path=None):
+        super().__init__(path, source_path)
+        self._used = {}
+
+    def get(self, kind, label):
+        """Return the cached entry for the given section, or None.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of the description, e.g. "module" or "iod".
+        label : str
+            The label of the section or chapter.
+
+        Returns
+        -------
+        tuple | None
+            The labeled nodes looked up while parsing (including the parsed
+            section itself) as sorted ``((element, label), hash)`` items,
+            the sorted dictionary lookups as recorded by the `ConditionParser`,
+            and the pickled descriptions by label.
+        """
+        return self._entries.get((kind, label))
+
+    def use(self, kind, label, entry):
+        """Mark the given entry as used in the current build,
+        so that it is saved."""
+        self._used[(kind, label)] = entry
+        self._changed = True
+
+    def _contents(self):
+        return self._used
@@ -29,24 +29,45 @@ class SpecReaderLookupError(SpecReaderError):
 class SpecReader:
     docbook_ns = "{http://docbook.org/ns/docbook}"
 
-    def __init__(self, spec_dir):
+    def __init__(self, spec_dir, doc_trees=None):
+        # already parsed document trees by part number (see `parse_doc_tree`)
         self.spec_dir = Path(spec_dir)
         self.part_nr = 0
         if not list(self.spec_dir.iterdir()):
             raise SpecReaderFileError(f"Missing docbook files in {self.spec_dir}")
-        self._doc_trees = {}
+        self._doc_trees = dict(doc_trees or {})
+        self._label_indexes = {}
+
+    @staticmethod
+    def parse_doc_tree(spec_dir, part_nr):
+        """Parse the docbook file for the given part and return the document tree.
+        Can be used to parse several parts concurrently, as the XML parser
+        does not hold the global interpreter lock while parsing.
+
+        Raises
+        ------
+        SpecReaderFileError
+            If the docbook file does not exist or cannot be parsed.
+        """
+        doc_name = SpecReader._doc_name(spec_dir, part_nr)
+        try:
+            return ElementTree.parse(doc_name)
+        except ElementTree.ParseError as e:
+            raise SpecReaderFileError(f"Parse error in docbook file {doc_name}: {e}")
+
+    @staticmethod
+    def _doc_name(spec_dir, part_nr):
+        spec_dir = Path(spec_dir)
+        doc_name = spec_dir / f"part{part_nr:02}.xml"
+        if doc_name not in spec_dir.iterdir():
+            raise SpecReaderFileError(f"Missing docbook file {doc_name}")
+        return doc_name
 
     def _get_doc_tree(self):
         if self.part_nr not in self._doc_trees:
-            doc_name = self.spec_dir / f"part{self.part_nr:02}.xml"
-            if doc_name not in self.spec_dir.iterdir():
-                raise SpecReaderFileError(f"Missing docbook file {doc_name}")
-            try:
-                self._doc_trees[self.part_nr] = ElementTree.parse(doc_name)
-            except ElementTree.ParseError as e:
-                raise SpecReaderFileError(
-                    f"Parse error in docbook file {doc_name}: {e}"
-                )
+            self._doc_trees[self.part_nr] = self.parse_doc_tree(
+                self.spec_dir, self.part_nr
+            )
         return self._doc_trees.get(self.part_nr)
 
     def get_doc_root(self):
@@ -54,6 +75,95 @@ class SpecReader:
         if doc_tree:
             return doc_tree.getroot()
 
+    def _find_labeled(self, element, label):
+        """Return the first element with the given tag name (without namespace)
+        and label in the document, or None if it does not exist.
+        The elements are looked up in an index created once per document,
+        which is much faster than searching the document for each lookup.
+        """
+        if self.part_nr not in self._label_indexes:
+            index = {}
+            doc_root = self.get_doc_root()
+            if doc_root is not None:
+                ns_length = len(self.docbook_ns)
+                for node in doc_root.iter():
+                    node_label = node.get("label")
+                    # comments and processing instructions have no string tag
+                    if node_label is not None and isinstance(node.tag, str):
+                        index.setdefault((node.tag[ns_length:], node_label), node)
+            self._label_indexes[self.part_nr] = index
+        return self._label_indexes[self.part_nr].get((element, label))
+
+    def _iter_table_rows(self, containers):
+        """Stream the docbook file of the part and yield the rows of the first
+        table directly contained in each of the given labeled elements.
+        The document is never held in memory as a whole - all elements
+        are removed from the tree as soon as they have been processed,
+        and parsing stops after the last table has been read.
+
+        Parameters
+        ----------
+        containers : Iterable[tuple[str, str]]
+            The tag names (without namespace) and labels of the elements
+            containing the tables, e.g. ``("chapter", "6")``.
+
+        Yields
+        ------
+        tuple[tuple[str, str], Element]
+            The containing element as given in `containers`
+            and a table body row node. The node is only valid until
+            the next row is requested.
+
+        Raises
+        ------
+        SpecReaderFileError
+            If the docbook file does not exist or cannot be parsed.
+        """
+        doc_name = self._doc_name(self.spec_dir, self.part_nr)
+        pending = set(containers)
+        ns = self.docbook_ns
+        row_tag, body_tag, table_tag = ns + "tr", ns + "tbody", ns + "table"
+        open_nodes = []
+        container = None
+        container_depth = 0
+        try:
+            with open(doc_name, "rb") as doc_file:
+                for event, node in ElementTree.iterparse(
+                    doc_file, events=("start", "end")
+                ):
+                    if event == "start":
+                        if container is None and isinstance(node.tag, str):
+                            key = (node.tag[len(ns) :], node.get("label"))
+                            if key in pending:
+                                container = key
+                                container_depth = len(open_nodes)
+                        open_nodes.append(node)
+                        continue
+                    open_nodes.pop()
+                    if container is not None:
+                        depth = len(open_nodes) - container_depth
+                        if depth > 3:
+                            # part of a row that is not complete yet
+                            continue
+                        if (
+                            depth == 3
+                            and node.tag == row_tag
+                            and open_nodes[-1].tag == body_tag
+                            and open_nodes[-2].tag == table_tag
+                        ):
+                            yield container, node
+                        elif depth == 0 or depth == 1 and node.tag == table_tag:
+                            pending.discard(container)
+                            container = None
+                            if not pending:
+                                break
+                    if open_nodes:
+                        # processed nodes are always the first child,
+                        # as all previous siblings have already been removed
+                        open_nodes[-1].remove(node)
+        except ElementTree.ParseError as e:
+            raise SpecReaderFileError(f"Parse error in docbook file {doc_name}: {e}")
+
     def _find(self, node, elements):
         search_string = "/".join([self.docbook_ns + element for element in elements])
         if node is not None:
@@ -71,6 +181,10 @@ class SpecReader:
         except AttributeError:
             return ""
 
+    @staticmethod
+    def _serialized(node):
+        return ElementTree.tostring(node)
+
     @staticmethod
     def cleaned_value(value):
         return value.replace("\u200B", "")
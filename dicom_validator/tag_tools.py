@@ -5,5 +5,16 @@ def tag_name_from_id_string(tag_id_string, dict_info):
 
 
 def tag_name_from_id(tag_id, dict_info):
-    tag_id_string = f"({tag_id // 0x10000:04X},{tag_id % 0x10000:04X})"
-    return tag_name_from_id_string(tag_id_string, dict_info)
+    return tag_name_from_id_string(tag_id_string(tag_id), dict_info)
+
+
+def tag_id_string(tag_id):
+    return f"({tag_id >> 16:04X},{tag_id & 0xFFFF:04X})"
+
+
+def tag_id_from_string(tag_id_string):
+    group, element = tag_id_string[1:-1].split(",")
+    # workaround for repeating tags -> special handling needed
+    if group.endswith("xx"):
+        group = group[:2] + "00"
+    return (int(group, 16) << 16) + int(element, 16)
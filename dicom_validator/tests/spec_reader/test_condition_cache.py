@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+import pytest
+
+from dicom_validator.spec_reader.condition import ConditionOperator
+from dicom_validator.spec_reader.condition_cache import ConditionCache
+from dicom_validator.spec_reader.condition_parser import ConditionParser
+
+CONDITION = "Required if Patient Position is present and equals HFS."
+
+DICT_INFO = {
+    "(0018,5100)": {"name": "Patient Position", "vr": "CS"},
+    "(0010,0010)": {"name": "Patient's Name", "vr": "PN"},
+}
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    yield tmp_path / "conditions.pickle"
+
+
+def parse_with_cache(cache_path, dict_info, condition_str=CONDITION):
+    cache = ConditionCache(cache_path)
+    result = ConditionParser(dict_info, cache).parse(condition_str)
+    cache.save()
+    return result
+
+
+def test_parsed_condition_is_reused(cache_path):
+    result = parse_with_cache(cache_path, DICT_INFO)
+    assert result.tag == "(0018,5100)"
+    assert cache_path.exists()
+
+    with patch.object(ConditionParser, "_parse") as parse_mock:
+        # changes in unrelated entries do not matter
+        dict_info = dict(DICT_INFO)
+        del dict_info["(0010,0010)"]
+        cached_result = parse_with_cache(cache_path, dict_info)
+        parse_mock.assert_not_called()
+    assert cached_result.tag == "(0018,5100)"
+    assert cached_result.operator == ConditionOperator.EqualsValue
+    assert cached_result.values == ["HFS"]
+    assert cached_result is not result
+
+
+def test_changed_dictionary_entry(cache_path):
+    parse_with_cache(cache_path, DICT_INFO)
+    dict_info = {"(0018,5101)": {"name": "Patient Position", "vr": "CS"}}
+    result = parse_with_cache(cache_path, dict_info)
+    assert result.tag == "(0018,5101)"
+    # both results are available
+    assert len(ConditionCache(cache_path).entries(CONDITION)) == 2
+    assert parse_with_cache(cache_path, DICT_INFO).tag == "(0018,5100)"
+
+
+def test_missing_dictionary_entry(cache_path):
+    result = parse_with_cache(cache_path, {})
+    assert result.tag is None
+    result = parse_with_cache(cache_path, DICT_INFO)
+    assert result.tag == "(0018,5100)"
+
+
+def test_cache_of_other_version_is_ignored(cache_path):
+    parse_with_cache(cache_path, DICT_INFO)
+    with patch("dicom_validator.spec_reader.condition_cache.__version__", "0.1"):
+        assert ConditionCache(cache_path).entries(CONDITION) == []
+
+
+def test_invalid_cache_file_is_ignored(cache_path):
+    cache_path.write_bytes(b"invalid")
+    result = parse_with_cache(cache_path, DICT_INFO)
+    assert result.tag == "(0018,5100)"
+    assert len(ConditionCache(cache_path).entries(CONDITION)) == 1
@@ -311,6 +311,23 @@ class TestValueConditionParser:
         assert result.operator == ConditionOperator.NotEqualsValue
         assert result.values == ["1.2.840.10008.5.1.4.1.1.4.4"]
 
+    def test_tag_name_lookup(self):
+        parser = ConditionParser(
+            {
+                "(0008,1150)": {"name": "Referenced SOP Class UID", "vr": "UI"},
+                "(0008,1160)": {"name": "Referenced Frame Number", "vr": "IS"},
+                "(0008,1161)": {"name": "Referenced Frame Number", "vr": "UL"},
+                "(0008,1170)": {"name": "Referenced SOP Class", "vr": "SQ"},
+            }
+        )
+        result = parser.parse("Required if Referenced Frame Number is present.")
+        assert result.tag == "(0008,1160)"
+        # exact name takes precedence over UID name without suffix
+        result = parser.parse("Required if Referenced SOP Class is present.")
+        assert result.tag == "(0008,1170)"
+        result = parser.parse("Required if Referenced SOP Class UID is present.")
+        assert result.tag == "(0008,1150)"
+
     def test_present_with_value(self, parser):
         result = parser.parse(
             "Required if Selector Attribute VR "
@@ -224,7 +224,7 @@ def test_recreate_json_if_needed(fs, base_path, edition_path):
         ):
             path = os.path.join(json_path, name)
             if not os.path.exists(path):
-                fs.create_file(path)
+                fs.create_file(path, contents="{}")
 
     docbook_path = base_path / "2014a" / "docbook"
     for chapter_name in ("part03.xml", "part04.xml", "part06.xml"):
@@ -273,6 +273,7 @@ def test_get_non_existing_revision(
     assert (json_path / "iod_info.json").exists()
     assert (json_path / "module_info.json").exists()
     assert (json_path / "uid_info.json").exists()
+    assert (json_path / EditionReader.dicom_info_cache).exists()
 
 
 @patch("dicom_validator.spec_reader.edition_reader.urlretrieve")
@@ -305,3 +306,90 @@ def test_failing_retrieval(retrieve_mock, base_path, edition_path, caplog):
     reader = EditionReader(base_path)
     assert reader.get_editions() is None
     assert "Failed to get DICOM editions" in caplog.text
+
+
+@pytest.fixture
+def json_path(fs, base_path):
+    path = base_path / "2014a" / "json"
+    for info_json, contents in (
+        (EditionReader.dict_info_json, '{"(0010,0010)": {"name": "Patient\'s Name"}}'),
+        (EditionReader.iod_info_json, '{"1.2.3": {"title": "Test IOD"}}'),
+        (EditionReader.module_info_json, '{"C.1": {}}'),
+    ):
+        fs.create_file(path / info_json, contents=contents)
+    yield path
+
+
+def test_load_dicom_info_does_not_write_cache(json_path):
+    dicom_info = EditionReader.load_dicom_info(json_path)
+    assert dicom_info.iods == {"1.2.3": {"title": "Test IOD"}}
+    assert not (json_path / EditionReader.dicom_info_cache).exists()
+
+
+def test_written_cache_is_used(json_path):
+    dicom_info = EditionReader.load_dicom_info(json_path)
+    EditionReader.write_dicom_info_cache(json_path, dicom_info)
+    assert EditionReader.load_dicom_info_cache(json_path) == dicom_info
+    assert EditionReader.load_dicom_info(json_path) == dicom_info
+
+
+def test_get_revision_writes_missing_cache(fs, base_path, edition_path, json_path):
+    docbook_path = base_path / "2014a" / "docbook"
+    for chapter_name in ("part03.xml", "part04.xml", "part06.xml"):
+        fs.create_file(docbook_path / chapter_name)
+    fs.create_file(json_path / EditionReader.uid_info_json, contents="{}")
+    EditionReader.write_current_version(json_path)
+    fs.create_file(edition_path, contents='["2014a", "2014c", "2015a"]')
+    reader = MemoryEditionReader(base_path, "")
+    assert reader.get_revision("2014a", create_json=False) is not None
+    assert not (json_path / EditionReader.dicom_info_cache).exists()
+    assert reader.get_revision("2014a") is not None
+    dicom_info = EditionReader.load_dicom_info_cache(json_path)
+    assert dicom_info.iods == {"1.2.3": {"title": "Test IOD"}}
+
+
+def test_outdated_cache_is_ignored(json_path):
+    EditionReader.write_dicom_info_cache(
+        json_path, EditionReader.load_dicom_info(json_path)
+    )
+    cache_time = (json_path / EditionReader.dicom_info_cache).stat().st_mtime
+    iod_info_path = json_path / EditionReader.iod_info_json
+    iod_info_path.write_text('{"1.2.4": {"title": "Other IOD"}}')
+    os.utime(iod_info_path, (cache_time + 1, cache_time + 1))
+    assert EditionReader.load_dicom_info_cache(json_path) is None
+    dicom_info = EditionReader.load_dicom_info(json_path)
+    assert dicom_info.iods == {"1.2.4": {"title": "Other IOD"}}
+
+
+def test_spec_fingerprint_changes_with_json_files(json_path):
+    fingerprint = EditionReader.spec_fingerprint(json_path)
+    assert EditionReader.spec_fingerprint(json_path) == fingerprint
+    EditionReader.write_current_version(json_path)
+    assert EditionReader.spec_fingerprint(json_path) != fingerprint
+    fingerprint = EditionReader.spec_fingerprint(json_path)
+    (json_path / EditionReader.module_info_json).write_text('{"C.2": {}}')
+    assert EditionReader.spec_fingerprint(json_path) != fingerprint
+
+
+def test_cache_from_older_version_is_ignored(json_path):
+    dicom_info = EditionReader.load_dicom_info(json_path)
+    with patch("dicom_validator.pickle_cache.__version__", "0.1"):
+        EditionReader.write_dicom_info_cache(json_path, dicom_info)
+    assert EditionReader.load_dicom_info_cache(json_path) is None
+
+
+def test_previous_section_cache(fs, base_path):
+    json_path = base_path / "2014c" / "json"
+    json_path.mkdir(parents=True)
+    assert EditionReader.previous_section_cache(json_path) is None
+    for revision, mtime in (("2014a", 2000), ("2014b", 1000)):
+        cache_path = base_path / revision / "json" / EditionReader.section_cache
+        fs.create_file(cache_path)
+        os.utime(cache_path, (mtime, mtime))
+    assert EditionReader.previous_section_cache(json_path) == (
+        base_path / "2014a" / "json" / EditionReader.section_cache
+    )
+    fs.create_file(json_path / EditionReader.section_cache)
+    assert EditionReader.previous_section_cache(json_path) == (
+        json_path / EditionReader.section_cache
+    )
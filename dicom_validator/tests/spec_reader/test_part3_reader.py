@@ -29,6 +29,40 @@ class TestReadPart3:
         with pytest.raises(SpecReaderFileError):
             spec_reader.iod_description("A.16")
 
+    @patch("dicom_validator.spec_reader.spec_reader.ElementTree", ElementTree)
+    def test_labeled_nodes_lookup(self, fs):
+        spec_path = Path("/var/dicom/specs")
+        fs.create_file(
+            spec_path / "part03.xml",
+            contents='<book xmlns="http://docbook.org/ns/docbook">'
+            '<chapter label="C"><section label="C.8"><section label="C.8.31">'
+            '<section label="C.8.31.6"><section label="C.8.31.7"/></section>'
+            '</section></section><table label="C.7-1"/></chapter></book>',
+        )
+        spec_reader = Part3Reader(spec_path, {})
+        assert spec_reader.find_section("C.8.31").get("label") == "C.8.31"
+        assert spec_reader.find_section("C.9") is None
+        assert spec_reader._get_section_node("C").tag.endswith("chapter")
+        # incorrectly nested section
+        section = spec_reader._get_section_node("C.8.31.7")
+        assert section.get("label") == "C.8.31.7"
+        table = spec_reader._get_ref_node("table", "C.7-1")
+        assert table.get("label") == "C.7-1"
+
+    @patch("dicom_validator.spec_reader.spec_reader.ElementTree", ElementTree)
+    def test_uses_parsed_doc_tree(self, fs):
+        spec_path = Path("/var/dicom/specs")
+        fs.create_file(
+            spec_path / "part03.xml",
+            contents='<book xmlns="http://docbook.org/ns/docbook">'
+            '<chapter label="C"><section label="C.8"/></chapter></book>',
+        )
+        doc_tree = Part3Reader.parse_doc_tree(spec_path, 3)
+        fs.create_file(spec_path / "part04.xml")
+        fs.remove_object(str(spec_path / "part03.xml"))
+        spec_reader = Part3Reader(spec_path, {}, {3: doc_tree})
+        assert spec_reader.find_section("C.8").get("label") == "C.8"
+
     @patch("dicom_validator.spec_reader.spec_reader.ElementTree", ElementTree)
     def test_read_invalid_doc_file(self, fs):
         spec_path = Path("/var/dicom/specs")
@@ -1,5 +1,10 @@
+from pathlib import Path
+
 import pytest
 
+from dicom_validator.spec_reader.part6_reader import Part6Reader
+from dicom_validator.spec_reader.spec_reader import SpecReaderParseError
+
 
 @pytest.mark.usefixtures("fs")
 class TestPart6Reader:
@@ -50,3 +55,62 @@ class TestPart6Reader:
         assert (
             dict_reader.sop_class_uid("CT Image Storage") == "1.2.840.10008.5.1.4.1.1.2"
         )
+
+
+def row(*columns):
+    return (
+        "<tr>"
+        + "".join(f"<td><para>{column}</para></td>" for column in columns)
+        + "</tr>"
+    )
+
+
+def test_streamed_registry_tables(fs):
+    spec_path = Path("/var/dicom/specs")
+    fs.create_file(
+        spec_path / "part06.xml",
+        contents='<book xmlns="http://docbook.org/ns/docbook">'
+        '<chapter label="5"><table><tbody>'
+        + row("(0008,0001)", "Wrong", "", "UL", "1", "")
+        + '</tbody></table></chapter><chapter label="6"><table><thead>'
+        + row("Tag", "Name", "Keyword", "VR", "VM", "")
+        + "</thead><tbody>"
+        + row("(0008,0005)", "Specific Character Set", "", "CS", "1-n", "")
+        + row("(0008,0006)", "Language Code Sequence", "", "SQ", "1", "")
+        + "</tbody></table></chapter>"
+        '<chapter label="A"><table><tbody>'
+        + row("1.2.840.10008.1.1", "Verification SOP Class", "SOP Class", "PS3.4")
+        + row("1.2.840.10008.1.2", "Implicit VR Little Endian", "Transfer Syntax", "")
+        + "</tbody></table><table><tbody>"
+        + row("1.2.3", "Other", "Other Type", "")
+        + "</tbody></table></chapter></book>",
+    )
+    reader = Part6Reader(spec_path)
+    assert reader.data_elements() == {
+        "(0008,0005)": {
+            "name": "Specific Character Set",
+            "vr": "CS",
+            "vm": "1-n",
+            "prop": "",
+        },
+        "(0008,0006)": {
+            "name": "Language Code Sequence",
+            "vr": "SQ",
+            "vm": "1",
+            "prop": "",
+        },
+    }
+    assert reader.all_uids() == {
+        "SOP Class": {"1.2.840.10008.1.1": "Verification SOP Class"},
+        "Transfer Syntax": {"1.2.840.10008.1.2": "Implicit VR Little Endian"},
+    }
+
+
+def test_missing_registry_table(fs):
+    spec_path = Path("/var/dicom/specs/empty")
+    fs.create_file(
+        spec_path / "part06.xml",
+        contents='<book xmlns="http://docbook.org/ns/docbook"></book>',
+    )
+    with pytest.raises(SpecReaderParseError):
+        Part6Reader(spec_path).data_elements()
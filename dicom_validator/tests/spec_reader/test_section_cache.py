@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from dicom_validator.spec_reader.part3_reader import Part3Reader
+from dicom_validator.spec_reader.section_cache import SectionCache
+
+CONDITION = "Required if Patient Position is present and equals HFS."
+
+DICT_INFO = {
+    "(0018,5100)": {"name": "Patient Position", "vr": "CS"},
+    "(0010,0010)": {"name": "Patient's Name", "vr": "PN"},
+}
+
+
+def write_part3(spec_path, enum_value="YES"):
+    spec_path.mkdir(parents=True, exist_ok=True)
+    (spec_path / "part03.xml").write_text(
+        '<book xmlns="http://docbook.org/ns/docbook">'
+        '<chapter label="C">'
+        '<section label="C.1"><title>Module 1</title><table><tbody><tr>'
+        "<td><para>Patient Position</para></td><td><para>(0018,5100)</para></td>"
+        '<td><para>3</para></td><td><para><xref linkend="sect_C.3"/></para></td>'
+        "</tr></tbody></table></section>"
+        '<section label="C.2"><title>Module 2</title><table><tbody><tr>'
+        "<td><para>Patient's Name</para></td><td><para>(0010,0010)</para></td>"
+        "<td><para>1C</para></td><td><para>" + CONDITION + "</para></td>"
+        "</tr></tbody></table></section>"
+        '<section label="C.3"><variablelist><title>Enumerated Values:</title>'
+        f"<varlistentry><term>{enum_value}</term></varlistentry>"
+        "</variablelist></section></chapter></book>"
+    )
+
+
+def read_modules(spec_path, cache_path, dict_info=DICT_INFO):
+    cache = SectionCache(cache_path)
+    reader = Part3Reader(spec_path, dict_info, section_cache=cache)
+    with patch.object(
+        Part3Reader,
+        "_parse_module_description",
+        side_effect=Part3Reader._parse_module_description,
+        autospec=True,
+    ) as parse_mock:
+        descriptions = {
+            section: reader.module_description(section) for section in ("C.1", "C.2")
+        }
+    cache.save()
+    parsed = [call.args[1].get("label") for call in parse_mock.call_args_list]
+    return descriptions, parsed
+
+
+def test_unchanged_sections_are_reused(tmp_path):
+    spec_path = tmp_path / "docbook"
+    cache_path = tmp_path / "sections.pickle"
+    write_part3(spec_path)
+    descriptions, parsed = read_modules(spec_path, cache_path)
+    assert parsed == ["C.1", "C.2"]
+    assert descriptions["C.1"]["(0018,5100)"]["enums"] == [{"val": ["YES"]}]
+
+    cached_descriptions, parsed = read_modules(spec_path, cache_path)
+    assert parsed == []
+    assert cached_descriptions["C.1"] == descriptions["C.1"]
+    assert (
+        cached_descriptions["C.2"]["(0010,0010)"]["cond"].tag
+        == descriptions["C.2"]["(0010,0010)"]["cond"].tag
+    )
+
+
+def test_sections_with_changed_references_are_parsed(tmp_path):
+    spec_path = tmp_path / "docbook"
+    cache_path = tmp_path / "sections.pickle"
+    write_part3(spec_path)
+    read_modules(spec_path, cache_path)
+
+    # changed linked enum section
+    write_part3(spec_path, enum_value="NO")
+    descriptions, parsed = read_modules(spec_path, cache_path)
+    assert parsed == ["C.1"]
+    assert descriptions["C.1"]["(0018,5100)"]["enums"] == [{"val": ["NO"]}]
+
+    # changed dictionary entry used in a condition
+    dict_info = dict(DICT_INFO)
+    dict_info["(0018,5101)"] = dict_info.pop("(0018,5100)")
+    descriptions, parsed = read_modules(spec_path, cache_path, dict_info)
+    assert parsed == ["C.1", "C.2"]
+    assert descriptions["C.2"]["(0010,0010)"]["cond"].tag == "(0018,5101)"
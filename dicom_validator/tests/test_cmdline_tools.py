@@ -1,4 +1,5 @@
 import logging
+import shutil
 from pathlib import Path
 
 import pytest
@@ -23,14 +24,18 @@ def dicom_fixture_path(fixture_path):
 
 @pytest.mark.order(0)
 @pytest.mark.parametrize("revision", ["2015b", "2023c"])
-def test_validate_sr(revision, caplog, standard_path, dicom_fixture_path):
+def test_validate_sr(revision, caplog, standard_path, dicom_fixture_path, tmp_path):
     # test also for 2015b to test an issue causing an exception
     rtdose_path = dicom_fixture_path / "rtdose.dcm"
-    # recreate json files to avoid getting the cached ones
-    # relies on the fact that this test is run first
+    # use a copy of the docbook files, so that the created JSON files
+    # and caches do not end up in the fixture directory
+    shutil.copy(standard_path / "editions.json", tmp_path)
+    shutil.copytree(
+        standard_path / revision / "docbook", tmp_path / revision / "docbook"
+    )
     cmd_line_args = [
         "-src",
-        str(standard_path),
+        str(tmp_path),
         "-r",
         revision,
         "--recreate-json",
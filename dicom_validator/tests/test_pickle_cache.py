@@ -0,0 +1,38 @@
+from unittest.mock import patch
+
+from dicom_validator import __version__
+from dicom_validator.pickle_cache import (
+    pickled,
+    read_cache_file,
+    unpickled,
+    write_cache_file,
+)
+
+
+def test_written_cache_file_is_read(tmp_path):
+    cache_path = tmp_path / "test.pickle"
+    assert write_cache_file(cache_path, {"key": [1, 2]})
+    assert read_cache_file(cache_path) == (__version__, {"key": [1, 2]})
+    assert [path.name for path in tmp_path.iterdir()] == ["test.pickle"]
+
+
+def test_missing_or_invalid_cache_file(tmp_path):
+    cache_path = tmp_path / "test.pickle"
+    assert read_cache_file(cache_path) is None
+    cache_path.write_bytes(b"invalid")
+    assert read_cache_file(cache_path) is None
+    cache_path.write_bytes(pickled(("1.0", "contents", "unexpected")))
+    assert read_cache_file(cache_path) is None
+
+
+def test_failing_write_keeps_no_temporary_file(tmp_path):
+    cache_path = tmp_path / "test.pickle"
+    with patch("dicom_validator.pickle_cache.os.replace", side_effect=OSError):
+        assert not write_cache_file(cache_path, "contents")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_invalid_pickled_data():
+    assert unpickled(pickled([1, "a"])) == [1, "a"]
+    assert unpickled(b"invalid") is None
+    assert unpickled(b"") is None
@@ -1,11 +1,15 @@
+import logging
 import os
+import shutil
 from pathlib import Path
 
 import pytest
-from pydicom import write_file
+from pydicom import dcmread, write_file
+from pydicom.dataelem import RawDataElement
 from pydicom.dataset import Dataset, FileDataset, FileMetaDataset
 
 from dicom_validator.validator.dicom_file_validator import DicomFileValidator
+from dicom_validator.validator.iod_validator import IODValidator
 
 pytestmark = pytest.mark.usefixtures("disable_logging")
 
@@ -96,3 +100,163 @@ def test_that_pixeldata_is_read(dicom_fixture_path, validator):
     assert "Tag (0008,1070) (Operators' Name) is missing" in results["RT Series"]
     # if PixelData is not read, RT Dose will show errors
     assert "RT Dose" not in results
+
+
+@pytest.mark.parametrize("stop_before_pixels", [False, True])
+def test_pixeldata_presence_without_reading(
+    dicom_info, dicom_fixture_path, stop_before_pixels
+):
+    rtdose_path = dicom_fixture_path / "rtdose.dcm"
+    expected = DicomFileValidator(dicom_info).validate(rtdose_path)
+    validator = DicomFileValidator(dicom_info, stop_before_pixels=stop_before_pixels)
+    assert validator.validate(rtdose_path) == expected
+    with open(rtdose_path, "rb") as f:
+        assert validator.validate_stream(f, rtdose_path) == expected
+
+
+def test_validate_non_seekable_stream(dicom_info, dicom_fixture_path):
+    rtdose_path = dicom_fixture_path / "rtdose.dcm"
+    validator = DicomFileValidator(dicom_info)
+    expected = validator.validate(rtdose_path)
+    read_fd, write_fd = os.pipe()
+    with open(write_fd, "wb") as f:
+        f.write(rtdose_path.read_bytes())
+    with open(read_fd, "rb") as f:
+        assert not f.seekable()
+        assert validator.validate_stream(f, rtdose_path) == expected
+
+
+@pytest.mark.parametrize("stop_before_pixels", [False, True])
+def test_validate_memory_mapped_files(
+    dicom_info, dicom_fixture_path, tmp_path, stop_before_pixels
+):
+    shutil.copy(dicom_fixture_path / "rtdose.dcm", tmp_path / "1.dcm")
+    (tmp_path / "2.dcm").write_text("invalid")
+    (tmp_path / "3.dcm").touch()
+    expected = DicomFileValidator(dicom_info).validate(str(tmp_path))
+    validator = DicomFileValidator(
+        dicom_info, stop_before_pixels=stop_before_pixels, reader="mmap"
+    )
+    assert validator.validate(str(tmp_path)) == expected
+
+
+def test_unknown_reader(dicom_info):
+    with pytest.raises(ValueError):
+        DicomFileValidator(dicom_info, reader="unknown")
+
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+@pytest.mark.parametrize("stop_before_pixels", [False, True])
+def test_validate_bytes(
+    dicom_info, dicom_fixture_path, buffer_type, stop_before_pixels
+):
+    rtdose_path = dicom_fixture_path / "rtdose.dcm"
+    expected = DicomFileValidator(dicom_info).validate(rtdose_path)[rtdose_path]
+    validator = DicomFileValidator(dicom_info, stop_before_pixels=stop_before_pixels)
+    data = buffer_type(rtdose_path.read_bytes())
+    assert validator.validate_bytes(data, "rtdose") == {"rtdose": expected}
+
+
+def test_validate_datasets(dicom_info, dicom_fixture_path):
+    rtdose_path = dicom_fixture_path / "rtdose.dcm"
+    expected = DicomFileValidator(dicom_info).validate(rtdose_path)[rtdose_path]
+    rtdose = dcmread(rtdose_path)
+    missing_sop_class = Dataset()
+
+    def datasets():
+        yield from (rtdose, missing_sop_class, rtdose)
+
+    results = list(DicomFileValidator(dicom_info).validate_datasets(datasets()))
+    assert [data_set for data_set, _ in results] == [
+        rtdose,
+        missing_sop_class,
+        rtdose,
+    ]
+    assert results[0][1] == expected
+    assert results[1][1] == {"fatal": "Missing SOPClassUID"}
+    assert results[2][1] == expected
+
+
+def test_validate_dir_in_processes(dicom_info, dicom_fixture_path, tmp_path):
+    for name in ("1.dcm", "3.dcm"):
+        shutil.copy(dicom_fixture_path / "rtdose.dcm", tmp_path / name)
+    (tmp_path / "sub").mkdir()
+    shutil.copy(dicom_fixture_path / "rtdose.dcm", tmp_path / "sub" / "0.dcm")
+    (tmp_path / "2.dcm").write_text("invalid")
+
+    expected = DicomFileValidator(dicom_info).validate(str(tmp_path))
+    error_dict = DicomFileValidator(dicom_info, jobs=2).validate(str(tmp_path))
+    assert list(error_dict.keys()) == [
+        str(tmp_path / "1.dcm"),
+        str(tmp_path / "2.dcm"),
+        str(tmp_path / "3.dcm"),
+        str(tmp_path / "sub" / "0.dcm"),
+    ]
+    assert error_dict == expected
+    assert error_dict[str(tmp_path / "2.dcm")] == {"fatal": "Invalid DICOM file"}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_quiet_mode(dicom_info, dicom_fixture_path, tmp_path, caplog, jobs):
+    for name in ("1.dcm", "3.dcm"):
+        shutil.copy(dicom_fixture_path / "rtdose.dcm", tmp_path / name)
+    (tmp_path / "2.dcm").write_text("invalid")
+    expected = DicomFileValidator(dicom_info).validate(str(tmp_path))
+
+    logging.disable(logging.NOTSET)
+    caplog.clear()
+    validator = DicomFileValidator(dicom_info, jobs=jobs, quiet=True)
+    with caplog.at_level(logging.DEBUG):
+        results = validator.validate(str(tmp_path))
+    assert not caplog.records
+    assert results != expected
+    assert validator.error_messages(results) == expected
+
+
+@pytest.mark.parametrize("prefetch", [1, 3])
+def test_validate_dir_with_prefetch(dicom_info, dicom_fixture_path, tmp_path, prefetch):
+    for name in ("1.dcm", "3.dcm", "4.dcm"):
+        shutil.copy(dicom_fixture_path / "rtdose.dcm", tmp_path / name)
+    (tmp_path / "2.dcm").write_text("invalid")
+
+    expected = DicomFileValidator(dicom_info).validate(str(tmp_path))
+    validator = DicomFileValidator(dicom_info, prefetch=prefetch)
+    error_dict = validator.validate(str(tmp_path))
+    assert list(error_dict.keys()) == list(expected.keys())
+    assert error_dict == expected
+
+
+def raw_element_count(data_set):
+    return sum(
+        isinstance(data_set.get_item(tag), RawDataElement) for tag in data_set.keys()
+    )
+
+
+@pytest.mark.parametrize("structure_cache", [False, True])
+def test_structure_cache(dicom_info, dicom_fixture_path, monkeypatch, structure_cache):
+    rtdose_path = dicom_fixture_path / "rtdose.dcm"
+    expected = DicomFileValidator(dicom_info).validate(rtdose_path)[rtdose_path]
+    validated_modules = []
+    validate_module = IODValidator._validate_module
+
+    def validate_module_mock(self, module, maybe_existing_modules):
+        validated_modules.append(module.name)
+        return validate_module(self, module, maybe_existing_modules)
+
+    monkeypatch.setattr(IODValidator, "_validate_module", validate_module_mock)
+    validator = DicomFileValidator(dicom_info, structure_cache=structure_cache)
+    data_sets = [dcmread(rtdose_path), dcmread(rtdose_path)]
+    raw_count = raw_element_count(data_sets[1])
+    results = validator.validate_datasets(data_sets)
+    assert next(results)[1] == expected
+    first_modules = list(validated_modules)
+    validated_modules.clear()
+    assert next(results)[1] == expected
+    if structure_cache:
+        # the result of the first dataset is reused without validating
+        # the modules and without converting elements that are not checked
+        assert not validated_modules
+        assert raw_element_count(data_sets[1]) > raw_element_count(data_sets[0])
+        assert raw_element_count(data_sets[1]) < raw_count
+    else:
+        assert validated_modules == first_modules
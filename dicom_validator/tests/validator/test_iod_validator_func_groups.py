@@ -1,3 +1,4 @@
+import copy
 import logging
 
 import pytest
@@ -6,6 +7,7 @@ from pydicom.dataset import Dataset, FileMetaDataset
 
 from dicom_validator.tests.utils import has_tag_error
 from dicom_validator.validator.iod_validator import IODValidator
+from dicom_validator.validator.tag_error import ErrorKind, TagError
 
 pytestmark = pytest.mark.usefixtures("disable_logging")
 
@@ -158,6 +160,22 @@ class TestIODValidatorFuncGroups:
             "present in both Shared and Per Frame Functional Groups",
         )
 
+    @pytest.mark.shared_macros([FRAME_ANATOMY])
+    @pytest.mark.per_frame_macros([FRAME_VOI_LUT])
+    def test_error_records(self, validator):
+        validator.validate()
+        errors = validator.error_records["Frame Content"]
+        path = ((0x52009230, 0),)
+        error = TagError(
+            0x00209111, ErrorKind.Missing, "Multi-frame Functional Groups", path
+        )
+        assert error in errors
+        assert next(iter(errors)).path == path
+        assert validator.errors["Frame Content"] == {
+            error.message(validator._dicom_info.dictionary): [error.tag_id_string]
+            for error in errors
+        }
+
     @pytest.mark.shared_macros([FRAME_CONTENT])
     @pytest.mark.per_frame_macros([FRAME_ANATOMY])
     def test_macro_not_allowed_in_shared_group(self, validator):
@@ -173,3 +191,88 @@ class TestIODValidatorFuncGroups:
         result = validator.validate()
         # Frame Anatomy Sequence (present in shared groups)
         assert has_tag_error(result, "Pixel Measures", "(0028,9110)", "not allowed")
+
+    @pytest.mark.shared_macros([FRAME_CONTENT])
+    @pytest.mark.per_frame_macros([FRAME_ANATOMY, FRAME_VOI_LUT])
+    def test_values_checked_in_all_per_frame_items(self, validator):
+        per_frame_groups = validator._dataset.PerFrameFunctionalGroupsSequence
+        per_frame_groups[1].FrameAnatomySequence[0].FrameLaterality = "X"
+        result = validator.validate()
+        assert has_tag_error(
+            result, "Frame Anatomy", "(0020,9072)", "value is not allowed", "value: X"
+        )
+        assert not has_tag_error(
+            result, "Frame Anatomy", "(0020,9072)", "value is not allowed", "value: R"
+        )
+
+    @pytest.mark.shared_macros([FRAME_CONTENT])
+    @pytest.mark.per_frame_macros([FRAME_ANATOMY, FRAME_VOI_LUT])
+    def test_per_frame_items_validated_once_per_structure(self, validator, monkeypatch):
+        validated_items = []
+        validate_modules = IODValidator._validate_func_group_modules
+
+        def validate_func_group_modules(self, modules):
+            validated_items.append(self._dataset_stack[-1].name)
+            validate_modules(self, modules)
+
+        monkeypatch.setattr(
+            IODValidator, "_validate_func_group_modules", validate_func_group_modules
+        )
+        per_frame_groups = validator._dataset.PerFrameFunctionalGroupsSequence
+        # values not used in conditions do not change the structure
+        per_frame_groups[1].FrameVOILUTSequence[0].WindowCenter = "100"
+        validator.validate()
+        assert validated_items == ["(5200,9229)", "(5200,9230)"]
+
+        validated_items.clear()
+        del per_frame_groups[2].FrameAnatomySequence[0].FrameLaterality
+        result = validator.validate()
+        assert validated_items == ["(5200,9229)", "(5200,9230)", "(5200,9230)"]
+        assert has_tag_error(result, "Frame Anatomy", "(0020,9072)", "missing")
+
+    def test_result_reused_for_same_structure(self, dicom_info, monkeypatch):
+        data_set = new_data_set([FRAME_CONTENT], [FRAME_ANATOMY, FRAME_VOI_LUT])
+        expected = IODValidator(data_set, dicom_info, logging.ERROR).validate()
+        structure_results = {}
+        validator = IODValidator(
+            data_set, dicom_info, logging.ERROR, structure_results=structure_results
+        )
+        assert validator.validate() == expected
+        assert len(structure_results) == 1
+
+        validated_modules = []
+        validate_module = IODValidator._validate_module
+
+        def validate_module_mock(self, module, maybe_existing_modules):
+            validated_modules.append(module.name)
+            return validate_module(self, module, maybe_existing_modules)
+
+        monkeypatch.setattr(IODValidator, "_validate_module", validate_module_mock)
+        # values not used in conditions do not change the structure
+        other_data_set = copy.deepcopy(data_set)
+        other_data_set.PatientName = "YYY"
+        validator.reset(other_data_set)
+        assert validator.validate() == expected
+        assert not validated_modules
+
+        # different results of value checks need a new validation
+        per_frame_groups = other_data_set.PerFrameFunctionalGroupsSequence
+        per_frame_groups[1].FrameAnatomySequence[0].FrameLaterality = "X"
+        validator.reset(other_data_set)
+        result = validator.validate()
+        assert validated_modules
+        assert has_tag_error(
+            result, "Frame Anatomy", "(0020,9072)", "value is not allowed", "value: X"
+        )
+        assert len(structure_results) == 1
+
+    def test_no_result_reuse_for_many_frames(self, dicom_info, monkeypatch):
+        data_set = new_data_set([FRAME_CONTENT], [FRAME_ANATOMY, FRAME_VOI_LUT])
+        monkeypatch.setattr(IODValidator, "max_structure_frames", 1)
+        structure_results = {}
+        validator = IODValidator(
+            data_set, dicom_info, logging.ERROR, structure_results=structure_results
+        )
+        expected = IODValidator(data_set, dicom_info, logging.ERROR).validate()
+        assert validator.validate() == expected
+        assert not structure_results
@@ -0,0 +1,153 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from dicom_validator.validator.dicom_file_validator import DicomFileValidator
+from dicom_validator.validator.result_cache import ResultCache
+
+pytestmark = pytest.mark.usefixtures("disable_logging")
+
+RESULT: Dict[str, Dict[str, list]] = {
+    "RT Series": {"Tag (0008,1070) (Operators' Name) is missing": []}
+}
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    yield tmp_path / "cache.sqlite"
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    path = tmp_path / "test.dcm"
+    path.write_bytes(b"contents")
+    yield str(path)
+
+
+@pytest.fixture
+def rtdose_dir(tmp_path):
+    rtdose_path = Path(__file__).parent.parent / "fixtures" / "dicom" / "rtdose.dcm"
+    dir_path = tmp_path / "dicom"
+    dir_path.mkdir()
+    for name in ("1.dcm", "2.dcm", "3.dcm"):
+        shutil.copy(rtdose_path, dir_path / name)
+    yield dir_path
+
+
+def touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_stored_result_is_used_for_unchanged_file(cache_path, file_path):
+    with ResultCache(cache_path, "2023c") as cache:
+        key = cache.settings_key({"quiet": False})
+        assert cache.get(file_path, os.stat(file_path), key) is None
+        cache.put(file_path, os.stat(file_path), key, RESULT)
+    with ResultCache(cache_path, "2023c") as cache:
+        assert cache.get(file_path, os.stat(file_path), key) == RESULT
+
+
+def test_stored_result_depends_on_settings(cache_path, file_path):
+    with ResultCache(cache_path, "2023c") as cache:
+        key = cache.settings_key({"quiet": False})
+        cache.put(file_path, os.stat(file_path), key, RESULT)
+        other_key = cache.settings_key({"quiet": True})
+        assert cache.get(file_path, os.stat(file_path), other_key) is None
+    with ResultCache(cache_path, "2024a") as cache:
+        other_key = cache.settings_key({"quiet": False})
+        assert cache.get(file_path, os.stat(file_path), other_key) is None
+
+
+def test_stored_result_depends_on_spec(cache_path, file_path):
+    with ResultCache(cache_path, "2023c", spec_fingerprint="1234") as cache:
+        key = cache.settings_key({"quiet": False})
+        cache.put(file_path, os.stat(file_path), key, RESULT)
+    with ResultCache(cache_path, "2023c", spec_fingerprint="5678") as cache:
+        other_key = cache.settings_key({"quiet": False})
+        assert cache.get(file_path, os.stat(file_path), other_key) is None
+
+
+def test_changed_file_is_not_used(cache_path, file_path):
+    with ResultCache(cache_path) as cache:
+        key = cache.settings_key({})
+        cache.put(file_path, os.stat(file_path), key, RESULT)
+        touch(file_path)
+        assert cache.get(file_path, os.stat(file_path), key) is None
+
+
+@pytest.mark.parametrize("changed", [False, True])
+def test_content_hash(cache_path, file_path, changed):
+    with ResultCache(cache_path, use_content_hash=True) as cache:
+        key = cache.settings_key({})
+        cache.put(file_path, os.stat(file_path), key, RESULT)
+        if changed:
+            Path(file_path).write_bytes(b"Contents")
+        touch(file_path)
+        result = cache.get(file_path, os.stat(file_path), key)
+        assert result == (None if changed else RESULT)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_only_changed_files_are_validated(
+    dicom_info, cache_path, rtdose_dir, monkeypatch, jobs
+):
+    expected = DicomFileValidator(dicom_info).validate(str(rtdose_dir))
+    with ResultCache(cache_path) as cache:
+        validator = DicomFileValidator(dicom_info, jobs=jobs, result_cache=cache)
+        assert validator.validate(str(rtdose_dir)) == expected
+
+    validated = []
+    validate_dicom = DicomFileValidator._validate_dicom
+
+    def validate_dicom_file(self, source, name):
+        validated.append(name)
+        return validate_dicom(self, source, name)
+
+    # validation in worker processes would not be registered
+    monkeypatch.setattr(DicomFileValidator, "_validate_dicom", validate_dicom_file)
+    changed_path = str(rtdose_dir / "2.dcm")
+    touch(changed_path)
+    with ResultCache(cache_path) as cache:
+        validator = DicomFileValidator(dicom_info, result_cache=cache)
+        assert validator.validate(str(rtdose_dir)) == expected
+    assert validated == [changed_path]
+
+
+@pytest.mark.parametrize("settings", [{"jobs": 2}, {"prefetch": 2}])
+def test_stored_results_used_in_concurrent_validation(
+    dicom_info, cache_path, rtdose_dir, settings
+):
+    (rtdose_dir / "0.dcm").write_text("invalid")
+    expected = DicomFileValidator(dicom_info).validate(str(rtdose_dir))
+    with ResultCache(cache_path) as cache:
+        DicomFileValidator(dicom_info, result_cache=cache).validate(str(rtdose_dir))
+    touch(rtdose_dir / "2.dcm")
+    with ResultCache(cache_path) as cache:
+        validator = DicomFileValidator(dicom_info, result_cache=cache, **settings)
+        error_dict = validator.validate(str(rtdose_dir))
+    assert list(error_dict.keys()) == list(expected.keys())
+    assert error_dict == expected
+
+
+def test_no_process_pool_for_cached_results(
+    dicom_info, cache_path, rtdose_dir, monkeypatch
+):
+    with ResultCache(cache_path) as cache:
+        expected = DicomFileValidator(dicom_info, result_cache=cache).validate(
+            str(rtdose_dir)
+        )
+
+    def process_pool(*args, **kwargs):
+        raise AssertionError("no process pool expected")
+
+    monkeypatch.setattr(
+        "dicom_validator.validator.dicom_file_validator.ProcessPoolExecutor",
+        process_pool,
+    )
+    with ResultCache(cache_path) as cache:
+        validator = DicomFileValidator(dicom_info, jobs=2, result_cache=cache)
+        assert validator.validate(str(rtdose_dir)) == expected
@@ -0,0 +1,147 @@
+import logging
+
+import pytest
+from pydicom.dataset import Dataset
+
+from dicom_validator.tests.utils import has_tag_error
+from dicom_validator.validator.iod_validator import DicomInfo, IODValidator
+from dicom_validator.validator.validation_plan import (
+    compiled_condition,
+    CompiledCondition,
+)
+
+pytestmark = pytest.mark.usefixtures("disable_logging")
+
+SOP_CLASS_UID = "1.2.3.4"
+
+
+@pytest.fixture
+def plan_dicom_info():
+    iods = {
+        SOP_CLASS_UID: {
+            "title": "Test IOD",
+            "modules": {
+                "Main": {"ref": "C.1", "use": "M"},
+            },
+            "group_macros": {},
+        }
+    }
+    modules = {
+        "C.1": {
+            "(0008,0016)": {"name": "SOP Class UID", "type": "1"},
+            "(0008,0060)": {"name": "Modality", "type": "1"},
+            "include": [
+                {"ref": "C.2"},
+                {
+                    "ref": "C.3",
+                    "cond": {
+                        "type": "MN",
+                        "op": "=",
+                        "tag": "(0008,0060)",
+                        "index": 0,
+                        "values": ["SR"],
+                    },
+                },
+            ],
+        },
+        "C.2": {
+            "(0010,0010)": {"name": "Patient's Name", "type": "2"},
+            "(0010,0020)": {
+                "name": "Patient ID",
+                "type": "1C",
+                "cond": {
+                    "type": "MN",
+                    "index": 0,
+                    "op": "=",
+                    "tag": "(0008,0060)",
+                    "values": ["SR"],
+                },
+            },
+            "(0040,A730)": {
+                "name": "Content Sequence",
+                "type": "3",
+                "items": {
+                    "(0040,A040)": {"name": "Value Type", "type": "1"},
+                },
+            },
+        },
+        "C.3": {
+            "(0040,A160)": {"name": "Text Value", "type": "1"},
+        },
+    }
+    yield DicomInfo({}, iods, modules)
+
+
+def validate(dicom_info, modality):
+    dataset = Dataset()
+    dataset.SOPClassUID = SOP_CLASS_UID
+    dataset.Modality = modality
+    return IODValidator(dataset, dicom_info, logging.ERROR).validate()
+
+
+def test_plan_is_shared(plan_dicom_info):
+    plan = plan_dicom_info.validation_plan(SOP_CLASS_UID)
+    assert plan_dicom_info.validation_plan(SOP_CLASS_UID) is plan
+    validate(plan_dicom_info, "CT")
+    assert plan_dicom_info.validation_plan(SOP_CLASS_UID) is plan
+
+
+def test_unconditional_includes_are_resolved(plan_dicom_info):
+    plan = plan_dicom_info.validation_plan(SOP_CLASS_UID)
+    assert [module.name for module in plan.modules] == ["Main"]
+    attributes = plan.modules[0].attributes
+    assert list(attributes.attributes) == [
+        0x00080016,
+        0x00080060,
+        0x00100010,
+        0x00100020,
+        0x0040A730,
+    ]
+    sequence = attributes.attributes[0x0040A730]
+    assert list(sequence.items.attributes) == [0x0040A040]
+    assert not attributes.is_static
+    assert len(attributes.conditional_includes) == 1
+
+
+def test_conditional_include_evaluated_per_dataset(plan_dicom_info):
+    result = validate(plan_dicom_info, "SR")
+    assert has_tag_error(result, "Main", "(0040,A160)", "missing")
+    assert has_tag_error(result, "Main", "(0010,0010)", "missing")
+
+    result = validate(plan_dicom_info, "CT")
+    assert not has_tag_error(result, "Main", "(0040,A160)", "missing")
+    assert has_tag_error(result, "Main", "(0010,0010)", "missing")
+
+
+def test_equal_conditions_share_key(plan_dicom_info):
+    plan = plan_dicom_info.validation_plan(SOP_CLASS_UID)
+    attributes = plan.modules[0].attributes
+    include_condition = attributes.conditional_includes[0][0]
+    assert include_condition is not attributes.attributes[0x00100020].cond
+    assert include_condition.key == attributes.attributes[0x00100020].cond.key
+
+
+def test_condition_evaluated_once_per_dataset(plan_dicom_info, monkeypatch):
+    evaluated = []
+    evaluate = CompiledCondition.evaluate
+
+    def counting_evaluate(self, lookup_tag):
+        evaluated.append(self.key)
+        return evaluate(self, lookup_tag)
+
+    monkeypatch.setattr(CompiledCondition, "evaluate", counting_evaluate)
+    result = validate(plan_dicom_info, "SR")
+    assert has_tag_error(result, "Main", "(0010,0020)", "missing")
+    assert len(evaluated) == 1
+
+
+def test_condition_values_converted_per_value_type():
+    condition = compiled_condition(
+        {"type": "MN", "op": ">", "tag": "(0028,0008)", "index": 0, "values": ["1"]}
+    )
+    dataset = Dataset()
+    dataset.NumberOfFrames = 2
+    assert condition.evaluate(dataset.get) == (True, True)
+    dataset.NumberOfFrames = 1
+    assert condition.evaluate(dataset.get) == (False, False)
+    assert list(condition._typed_values.values()) == [(1,)]
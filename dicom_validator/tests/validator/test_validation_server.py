@@ -0,0 +1,128 @@
+import json
+import threading
+from contextlib import contextmanager
+from http.client import HTTPConnection
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from dicom_validator.validator.dicom_file_validator import DicomFileValidator
+from dicom_validator.validator.validation_server import ValidationServer
+
+pytestmark = pytest.mark.usefixtures("disable_logging")
+
+
+@pytest.fixture(scope="module")
+def rtdose_path():
+    yield Path(__file__).parent.parent / "fixtures" / "dicom" / "rtdose.dcm"
+
+
+@pytest.fixture
+def validator(dicom_info):
+    yield DicomFileValidator(dicom_info)
+
+
+@contextmanager
+def running_server(validator, host):
+    server = ValidationServer(validator, host=host, revision="2023c")
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def server_port(validator):
+    with running_server(validator, "127.0.0.1") as port:
+        yield port
+
+
+@pytest.fixture
+def server_url(server_port):
+    yield f"http://127.0.0.1:{server_port}"
+
+
+@pytest.fixture
+def public_server_url(validator):
+    # the server is also reachable via the loopback address
+    with running_server(validator, "0.0.0.0") as port:
+        yield f"http://127.0.0.1:{port}"
+
+
+def post(url, data, content_type):
+    request = Request(url, data=data, headers={"Content-Type": content_type})
+    with urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_status(server_url):
+    with urlopen(server_url + "/status") as response:
+        status = json.loads(response.read())
+    assert status["revision"] == "2023c"
+
+
+def test_validate_paths(server_url, validator, rtdose_path):
+    result = post(
+        server_url + "/validate",
+        json.dumps({"paths": [str(rtdose_path), "non_existing"]}).encode(),
+        "application/json",
+    )
+    assert (
+        result[str(rtdose_path)]
+        == validator.validate(str(rtdose_path))[str(rtdose_path)]
+    )
+    assert result["non_existing"] == {"fatal": "File missing"}
+
+
+def test_validate_data(server_url, validator, rtdose_path):
+    result = post(
+        server_url + "/validate?name=rtdose",
+        rtdose_path.read_bytes(),
+        "application/dicom",
+    )
+    expected = validator.validate(str(rtdose_path))[str(rtdose_path)]
+    assert result == {"rtdose": expected}
+
+
+def test_invalid_request(server_url):
+    with pytest.raises(HTTPError) as exc_info:
+        post(server_url + "/validate", b'{"files": []}', "application/json")
+    assert exc_info.value.code == 400
+    with pytest.raises(HTTPError) as exc_info:
+        post(server_url + "/unknown", b"", "application/json")
+    assert exc_info.value.code == 404
+
+
+def test_invalid_content_length(server_port):
+    connection = HTTPConnection("127.0.0.1", server_port)
+    try:
+        connection.putrequest("POST", "/validate")
+        connection.putheader("Content-Type", "application/dicom")
+        connection.putheader("Content-Length", "invalid")
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read()) == {"error": "Invalid Content-Length"}
+    finally:
+        connection.close()
+
+
+def test_paths_rejected_on_public_address(public_server_url, validator, rtdose_path):
+    with pytest.raises(HTTPError) as exc_info:
+        post(
+            public_server_url + "/validate",
+            json.dumps({"paths": [str(rtdose_path)]}).encode(),
+            "application/json",
+        )
+    assert exc_info.value.code == 403
+    result = post(
+        public_server_url + "/validate?name=rtdose",
+        rtdose_path.read_bytes(),
+        "application/dicom",
+    )
+    expected = validator.validate(str(rtdose_path))[str(rtdose_path)]
+    assert result == {"rtdose": expected}
@@ -1,25 +1,72 @@
 import argparse
 import logging
+import multiprocessing
 from pathlib import Path
 import sys
 
 from dicom_validator.spec_reader.edition_reader import EditionReader
-from dicom_validator.validator.dicom_file_validator import DicomFileValidator
+from dicom_validator.validator.dicom_file_validator import (
+    DicomFileValidator,
+    READERS,
+)
+from dicom_validator.validator.result_cache import ResultCache
+from dicom_validator.validator.validation_server import ValidationServer
+
+# the file name of the validation result cache in the standard path
+RESULT_CACHE_NAME = "validation_results.sqlite"
 
 
 def validate(args, base_path):
     json_path = Path(base_path, "json")
     dicom_info = EditionReader.load_dicom_info(json_path)
     log_level = logging.DEBUG if args.verbose else logging.INFO
+    revision = Path(base_path).name
+    result_cache = None
+    if args.cache:
+        result_cache = ResultCache(
+            Path(args.standard_path, RESULT_CACHE_NAME),
+            revision,
+            args.cache_content_hash,
+            EditionReader.spec_fingerprint(json_path),
+        )
     validator = DicomFileValidator(
-        dicom_info, log_level, args.force_read, args.suppress_vr_warnings
+        dicom_info,
+        log_level,
+        args.force_read,
+        args.suppress_vr_warnings,
+        args.jobs,
+        args.stop_before_pixels,
+        args.quiet,
+        result_cache,
+        args.prefetch,
+        args.reader,
+        args.structure_cache,
     )
-    error_nr = 0
-    for dicom_path in args.dicomfiles:
-        error_nr += sum(
-            len(error) for error in list(validator.validate(dicom_path).values())
-        )
-    return error_nr
+    try:
+        if args.serve:
+            return serve(validator, args, revision)
+        error_nr = 0
+        for dicom_path in args.dicomfiles:
+            error_nr += sum(
+                len(error) for error in list(validator.validate(dicom_path).values())
+            )
+        return error_nr
+    finally:
+        if result_cache is not None:
+            result_cache.close()
+
+
+def serve(validator, args, revision):
+    server = ValidationServer(validator, args.host, args.port, revision)
+    host, port = server.server_address[:2]
+    print(f"Serving DICOM validation on http://{host}:{port} - press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
 
 
 def main(args=None):
@@ -27,7 +74,7 @@ def main(args=None):
     parser.add_argument(
         "dicomfiles",
         help="Path(s) of DICOM files or directories " "to validate",
-        nargs="+",
+        nargs="*",
     )
     parser.add_argument(
         "--standard-path",
@@ -62,10 +109,89 @@ def main(args=None):
         help="Suppress warnings for values not matching value representation (VR)",
         default=False,
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of processes used to validate the files in directories "
+        "(0 uses the number of available CPUs)",
+        default=1,
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        help="Number of files in directories that are read ahead "
+        "while validating (only used without --jobs)",
+        default=0,
+    )
+    parser.add_argument(
+        "--reader",
+        choices=READERS,
+        help='How DICOM files are read - "mmap" maps the files into memory, '
+        "which may be faster for large files",
+        default="dcmread",
+    )
+    parser.add_argument(
+        "--stop-before-pixels",
+        action="store_true",
+        help="Read the DICOM files only up to the pixel data, "
+        "tags after the pixel data are not validated",
+        default=False,
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Store the validation results in a cache in the standard path, "
+        "and only validate files that have changed since the last validation",
+        default=False,
+    )
+    parser.add_argument(
+        "--cache-content-hash",
+        action="store_true",
+        help="Additionally compare the file contents to detect unchanged files "
+        "with a changed modification time (only used with --cache)",
+        default=False,
+    )
+    parser.add_argument(
+        "--structure-cache",
+        action="store_true",
+        help="Reuse the validation results for files with the same structure "
+        "as a previously validated file, e.g. in the same series",
+        default=False,
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a local HTTP server that validates the DICOM files or data "
+        "posted to it instead of validating the given files",
+        default=False,
+    )
+    parser.add_argument(
+        "--host",
+        help="Host name the server is bound to (only used with --serve); "
+        "validation of local paths is only supported on loopback addresses",
+        default="127.0.0.1",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Port the server listens to (only used with --serve)",
+        default=8765,
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Outputs diagnostic information"
     )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Do not output the validation results, only return "
+        "the number of errors as exit code",
+        default=False,
+    )
     args = parser.parse_args(args)
+    if not args.dicomfiles and not args.serve:
+        parser.error("the following arguments are required: dicomfiles")
 
     edition_reader = EditionReader(args.standard_path)
     destination = edition_reader.get_revision(args.revision, args.recreate_json)
@@ -77,4 +203,6 @@ def main(args=None):
 
 
 if __name__ == "__main__":
+    # needed for the process pool in frozen executables
+    multiprocessing.freeze_support()
     sys.exit(main())
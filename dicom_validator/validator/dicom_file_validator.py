@@ -1,20 +1,168 @@
+import io
 import logging
+import mmap
 import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from pydicom import config, dcmread
+from pydicom.datadict import dictionary_VR
 from pydicom.errors import InvalidDicomError
+from pydicom.filereader import read_partial
 
-from dicom_validator.validator.iod_validator import IODValidator
+from dicom_validator.validator.iod_validator import IODValidator, log_errors
+from dicom_validator.validator.tag_error import error_messages
+
+
+class _RecordCollector(logging.Handler):
+    """Collects the log records emitted in a worker process,
+    so that they can be handled in the main process in file order."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        # make sure the record can be pickled
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only binary stream over a buffer (e.g. a memoryview).
+    Contrary to `io.BytesIO`, the buffer is not copied on creation;
+    only the read parts are copied.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._pos = offset
+        return offset
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        data = self._view[self._pos : end].tobytes()
+        self._pos += len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+# the supported ways to read DICOM files (see `DicomFileValidator`)
+READERS = ("dcmread", "mmap")
+
+# the tags of Float Pixel Data, Double Float Pixel Data and Pixel Data
+PIXEL_DATA_TAGS = (0x7FE00008, 0x7FE00009, 0x7FE00010)
+
+# the validator and log collector used in a worker process
+_worker_validator = None
+_worker_log_collector = None
+
+
+def _init_worker(dicom_info, settings):
+    global _worker_validator, _worker_log_collector
+    _worker_log_collector = _RecordCollector()
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.addHandler(_worker_log_collector)
+    _worker_validator = DicomFileValidator(dicom_info, **settings)
+
+
+def _validate_in_worker(path):
+    _worker_log_collector.records = []
+    errors = _worker_validator.validate(path)
+    return errors, _worker_log_collector.records
 
 
 class DicomFileValidator:
+    """Validates DICOM files and directories.
+
+    Parameters
+    ----------
+    dicom_info : DicomInfo
+        The DICOM information read from the standard.
+    log_level : int
+        The log level used for validation output.
+    force_read : bool
+        If True, files without DICOM header are also read.
+    suppress_vr_warnings : bool
+        If True, values are not checked against their VR.
+    jobs : int
+        The number of worker processes used to validate the files
+        in a directory. If 1, all files are validated in the current
+        process, if 0, the number of available CPUs is used.
+    stop_before_pixels : bool
+        If True, DICOM files are only read up to the pixel data, which
+        is not validated anyway. The pixel data is replaced by an empty
+        placeholder, so that conditions checking its presence still work.
+        Tags following the pixel data are not read and validated.
+    quiet : bool
+        If True, nothing is logged, and the validation results contain
+        the structured error records (see `IODValidator.validate_records`)
+        instead of error messages. The messages can be created on demand
+        using `error_messages`.
+    result_cache : ResultCache | None
+        If given, the results of validated files are stored in the cache,
+        and the stored results of unchanged files are used instead of
+        validating them again.
+    prefetch : int
+        The number of files read ahead in background threads while a file
+        in a directory is validated, which is useful if reading the files
+        is slow (e.g. on network drives); 0 disables reading ahead.
+        Only used if the files are validated in the current process.
+    reader : str
+        The way DICOM files are read: "dcmread" reads them via file
+        objects, "mmap" maps them into memory, so that only the needed
+        parts of the file are loaded, which may be faster for large files.
+    structure_cache : bool
+        If True, the validation results are reused for files with the same
+        structure as a previously validated file (e.g. in the same series),
+        if the value checks give the same results.
+    """
+
     def __init__(
         self,
         dicom_info,
         log_level=logging.INFO,
         force_read=False,
         suppress_vr_warnings=False,
+        jobs=1,
+        stop_before_pixels=False,
+        quiet=False,
+        result_cache=None,
+        prefetch=0,
+        reader="dcmread",
+        structure_cache=False,
     ):
         self._dicom_info = dicom_info
         self.logger = logging.getLogger()
@@ -23,12 +171,68 @@ class DicomFileValidator:
             self.logger.addHandler(logging.StreamHandler(sys.stdout))
         self._force_read = force_read
         self._suppress_vr_warnings = suppress_vr_warnings
+        self._jobs = jobs or os.cpu_count() or 1
+        self._stop_before_pixels = stop_before_pixels
+        self._quiet = quiet
+        self._prefetch = prefetch
+        if reader not in READERS:
+            raise ValueError(f"Unknown reader: {reader}")
+        self._reader = reader
+        # the validation results by dataset structure, shared by all
+        # validated files, if the structure cache is used
+        self._structure_results = {} if structure_cache else None
+        self._result_cache = result_cache
+        if result_cache is not None:
+            # the settings that don't influence the results
+            settings = self._settings()
+            del settings["log_level"]
+            del settings["reader"]
+            del settings["structure_cache"]
+            self._cache_key = result_cache.settings_key(settings)
+
+    @property
+    def quiet(self):
+        """True if the validator runs in quiet mode."""
+        return self._quiet
+
+    def _settings(self):
+        """Return the settings needed to create a validator in a worker process."""
+        return {
+            "log_level": self.logger.level,
+            "force_read": self._force_read,
+            "suppress_vr_warnings": self._suppress_vr_warnings,
+            "stop_before_pixels": self._stop_before_pixels,
+            "quiet": self._quiet,
+            "reader": self._reader,
+            "structure_cache": self._structure_results is not None,
+        }
+
+    def error_messages(self, results):
+        """Return the error messages for validation results in quiet mode.
+
+        Parameters
+        ----------
+        results : dict
+            The error records by file path or name, as returned by the
+            validation methods in quiet mode.
+
+        Returns
+        -------
+        dict
+            The error messages by file path or name, as returned by the
+            validation methods if not in quiet mode.
+        """
+        return {
+            name: error_messages(records, self._dicom_info.dictionary)
+            for name, records in results.items()
+        }
 
     def validate(self, path):
         errors = {}
         if not os.path.exists(path):
             errors.update({path: {"fatal": "File missing"}})
-            self.logger.warning('\n"%s" does not exist - skipping', path)
+            if not self._quiet:
+                self.logger.warning('\n"%s" does not exist - skipping', path)
         else:
             if os.path.isdir(path):
                 errors.update(self.validate_dir(path))
@@ -37,14 +241,205 @@ class DicomFileValidator:
         return errors
 
     def validate_dir(self, dir_path):
+        paths = []
+        for root, dirs, names in os.walk(dir_path):
+            # walk in sorted order to get reproducible results
+            dirs.sort()
+            paths.extend(os.path.join(root, name) for name in sorted(names))
+        if self._jobs > 1 and len(paths) > 1:
+            return self._validate_in_processes(paths)
+        if self._prefetch > 0 and len(paths) > 1:
+            return self._validate_with_prefetch(paths)
         errors = {}
-        for root, _, names in os.walk(dir_path):
-            for name in names:
-                errors.update(self.validate(os.path.join(root, name)))
+        for path in paths:
+            errors.update(self.validate(path))
+        return errors
+
+    def _validate_in_processes(self, paths):
+        """Validate the given files in a process pool.
+        Each worker process creates its own validator on startup.
+        The results and log output are collected in the order of the paths.
+        """
+        errors = {}
+        stats = {}
+        cached = {}
+        for path in paths:
+            stats[path], result = self._stored_result(path)
+            if result is not None:
+                cached[path] = result
+        uncached_paths = [path for path in paths if path not in cached]
+        if not uncached_paths:
+            for path in paths:
+                self._log_cached_result(path, cached[path])
+            return cached
+        jobs = max(1, min(self._jobs, len(uncached_paths)))
+        chunk_size = max(1, min(64, len(uncached_paths) // (jobs * 4)))
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(self._dicom_info, self._settings()),
+        ) as executor:
+            results = executor.map(
+                _validate_in_worker, uncached_paths, chunksize=chunk_size
+            )
+            for path in paths:
+                if path in cached:
+                    self._log_cached_result(path, cached[path])
+                    errors[path] = cached[path]
+                    continue
+                file_errors, records = next(results)
+                for record in records:
+                    logging.getLogger(record.name).handle(record)
+                errors.update(file_errors)
+                self._store_result(path, stats[path], file_errors[path])
+        return errors
+
+    def _validate_with_prefetch(self, paths):
+        """Validate the given files sequentially, while the next files
+        are read in background threads.
+        At most `prefetch` files are read ahead of the validated file.
+        """
+        errors = {}
+        pending = deque()
+        paths = iter(paths)
+        with ThreadPoolExecutor(max_workers=self._prefetch) as executor:
+            while True:
+                while len(pending) <= self._prefetch:
+                    path = next(paths, None)
+                    if path is None:
+                        break
+                    stat, result = self._stored_result(path)
+                    read_future = None
+                    if result is None:
+                        read_future = executor.submit(self._read_dicom, path)
+                    pending.append((path, stat, result, read_future))
+                if not pending:
+                    break
+                path, stat, result, read_future = pending.popleft()
+                if result is not None:
+                    self._log_cached_result(path, result)
+                else:
+                    if not self._quiet:
+                        self.logger.info('\nProcessing DICOM file "%s"', path)
+                    result = self._validate_data_set(read_future.result(), path)
+                    self._store_result(path, stat, result)
+                errors[path] = result
         return errors
 
     def validate_file(self, file_path):
-        self.logger.info('\nProcessing DICOM file "%s"', file_path)
+        stat, result = self._stored_result(file_path)
+        if result is not None:
+            self._log_cached_result(file_path, result)
+        else:
+            if not self._quiet:
+                self.logger.info('\nProcessing DICOM file "%s"', file_path)
+            result = self._validate_dicom(file_path, file_path)
+            self._store_result(file_path, stat, result)
+        return {file_path: result}
+
+    def _stored_result(self, file_path):
+        """Return the file status and the stored result for the given file,
+        if the result cache is used. The result is None if the file has
+        changed since it has been stored."""
+        if self._result_cache is None:
+            return None, None
+        stat = os.stat(file_path)
+        return stat, self._result_cache.get(file_path, stat, self._cache_key)
+
+    def _store_result(self, file_path, stat, result):
+        if self._result_cache is not None:
+            self._result_cache.put(file_path, stat, self._cache_key, result)
+
+    def _log_cached_result(self, file_path, result):
+        if not self._quiet:
+            self.logger.info('\nUsing stored result for DICOM file "%s"', file_path)
+            log_errors(logging.getLogger("validator"), result)
+
+    def validate_stream(self, stream, name):
+        """Validate the DICOM data read from a binary file-like object.
+        Streams that are not seekable (e.g. pipes, sockets or
+        `sys.stdin.buffer`) are read into memory first, as the data
+        has to be accessed repeatedly.
+
+        Parameters
+        ----------
+        stream : BinaryIO
+            The stream containing the DICOM data.
+        name : str
+            The name used as key in the result and in the output.
+
+        Returns
+        -------
+        dict
+            The validation errors with the given name as key.
+        """
+        if not self._quiet:
+            self.logger.info('\nProcessing DICOM data "%s"', name)
+        if not stream.seekable():
+            with io.BytesIO(stream.read()) as buffered_stream:
+                return {name: self._validate_dicom(buffered_stream, name)}
+        return {name: self._validate_dicom(stream, name)}
+
+    def validate_bytes(self, data, name):
+        """Validate DICOM data given as a bytes-like object.
+        The data is read in place without copying the whole buffer, so this
+        is suited for DICOM data received over the network (e.g. via STOW-RS).
+        The settings for reading files (e.g. `stop_before_pixels`) apply.
+
+        Parameters
+        ----------
+        data : bytes | bytearray | memoryview
+            The DICOM data, optionally including the preamble.
+        name : str
+            The name used as key in the result and in the output.
+
+        Returns
+        -------
+        dict
+            The validation errors with the given name as key.
+        """
+        # BytesIO shares the buffer of a bytes object
+        stream_type = io.BytesIO if isinstance(data, bytes) else BufferReader
+        with stream_type(data) as stream:
+            return self.validate_stream(stream, name)
+
+    def validate_datasets(self, datasets):
+        """Validate already loaded datasets.
+        The same IOD validator is used for all datasets, and the datasets
+        are validated lazily, so that the results can be processed while
+        the datasets are still produced (e.g. by a storage SCP).
+
+        Parameters
+        ----------
+        datasets : Iterable[Dataset]
+            The pydicom datasets to validate.
+
+        Yields
+        ------
+        tuple[Dataset, dict]
+            Each dataset together with its validation errors,
+            in the order of the given datasets.
+        """
+        validator = None
+        for data_set in datasets:
+            if validator is None:
+                validator = IODValidator(
+                    data_set,
+                    self._dicom_info,
+                    self.logger.level,
+                    suppress_vr_warnings=self._suppress_vr_warnings,
+                    structure_results=self._structure_results,
+                )
+            else:
+                validator.reset(data_set)
+            yield data_set, self._validate_iod(validator)
+
+    def _validate_dicom(self, source, name):
+        return self._validate_data_set(self._read_dicom(source), name)
+
+    def _read_dicom(self, source):
+        """Return the dataset read from the given source,
+        or None if it is not valid DICOM."""
         try:
             # dcmread calls validate_value by default. If values don't match
             # required VR (value representation), it emits a warning but
@@ -52,16 +447,70 @@ class DicomFileValidator:
             # We will handle it later (optionally) by calling validate_value
             # directly.
             config.settings.reading_validation_mode = config.IGNORE
-            data_set = dcmread(file_path, defer_size=1024, force=self._force_read)
-
+            return self._read_dataset(source)
         except InvalidDicomError:
-            self.logger.error(f"Invalid DICOM file: {file_path}")
-            return {file_path: {"fatal": "Invalid DICOM file"}}
-        return {
-            file_path: IODValidator(
+            return None
+
+    def _validate_data_set(self, data_set, name):
+        if data_set is None:
+            if not self._quiet:
+                self.logger.error(f"Invalid DICOM file: {name}")
+            return {"fatal": "Invalid DICOM file"}
+        return self._validate_iod(
+            IODValidator(
                 data_set,
                 self._dicom_info,
                 self.logger.level,
                 suppress_vr_warnings=self._suppress_vr_warnings,
-            ).validate()
-        }
+                structure_results=self._structure_results,
+            )
+        )
+
+    def _validate_iod(self, validator):
+        if self._quiet:
+            return validator.validate_records()
+        return validator.validate()
+
+    def _read_dataset(self, source):
+        if self._reader == "mmap" and isinstance(source, (str, os.PathLike)):
+            source = self._mapped_file(source)
+        if not self._stop_before_pixels:
+            return dcmread(source, defer_size=1024, force=self._force_read)
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                return self._read_header(f)
+        return self._read_header(source)
+
+    @staticmethod
+    def _mapped_file(path):
+        """Return the memory-mapped file with the given path, which can be
+        read like a file object. Only the read parts are copied.
+        The mapping is closed when it is no longer referenced by the dataset
+        read from it, which uses it for deferred reading of large values.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # empty files cannot be mapped
+                return io.BytesIO()
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _read_header(self, fp):
+        """Read the dataset up to the pixel data.
+        The pixel data element is added with an empty value, as its existence
+        may be checked in conditions.
+        """
+        pixel_data = []
+
+        def at_pixel_data(tag, vr, _length):
+            if tag in PIXEL_DATA_TAGS:
+                pixel_data.append((tag, vr))
+                return True
+            return False
+
+        data_set = read_partial(
+            fp, stop_when=at_pixel_data, defer_size=1024, force=self._force_read
+        )
+        for tag, vr in pixel_data:
+            # the VR is not known for implicit transfer syntaxes
+            data_set.add_new(tag, vr or dictionary_VR(tag).split()[0], b"")
+        return data_set
@@ -1,26 +1,39 @@
 import json
 import logging
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from pydicom import config, Sequence
+from pydicom.dataelem import RawDataElement
+from pydicom.datadict import dictionary_VR
 from pydicom.multival import MultiValue
 from pydicom.valuerep import validate_value
-from pydicom.tag import Tag
 
-from dicom_validator.spec_reader.condition import (
-    Condition,
-    ConditionType,
-    ConditionOperator,
-)
-from dicom_validator.tag_tools import tag_name_from_id
+from dicom_validator.spec_reader.condition import ConditionType
+from dicom_validator.validator.tag_error import ErrorKind, TagError, error_messages
+from dicom_validator.validator.validation_plan import ValidationPlanCompiler
 
 
 class DatasetStackItem:
-    def __init__(self, dataset, name):
+    def __init__(self, dataset, name, path=()):
         self.dataset = dataset
         self.name = name
-        self.unexpected_tags = {int(d.tag) for d in dataset if not d.tag.is_private}
+        # the sequence tag IDs and item indexes leading to the dataset
+        self.path = path
+        # the tag IDs in the dataset; checking these is faster than checking
+        # the dataset itself, which converts the tag ID on each access
+        self.tags = dataset.keys()
+        self.unexpected_tags = {int(tag) for tag in self.tags if not tag.is_private}
+        # the evaluated conditions by condition key; a condition result only
+        # depends on this and the parent datasets, so it can be reused as long
+        # as the item is on the stack
+        self.condition_results = {}
+
+
+SHARED_GROUPS = "(5200,9229)"
+PER_FRAME_GROUPS = "(5200,9230)"
+SHARED_GROUPS_TAG_ID = 0x52009229
+PER_FRAME_GROUPS_TAG_ID = 0x52009230
 
 
 @dataclass
@@ -31,13 +44,22 @@ class FunctionalGroupInfo:
     """
 
     shared_results: dict  # the result of the shared group validation
-    checked_modules: set  # the names of already validated macro modules
+    # the results of required macro modules in the currently validated
+    # per-frame item, with the top-level sequence tag ID of the macro
+    per_frame_results: dict
+    # the value checks (see `ValueCheck`) of the macro modules in the
+    # currently validated per-frame item
+    value_checks: dict
 
     def clear(self):
         self.shared_results.clear()
-        self.checked_modules.clear()
+        self.clear_per_frame()
+
+    def clear_per_frame(self):
+        self.per_frame_results.clear()
+        self.value_checks.clear()
 
-    def combined(self, module_name, seq_tag, per_frame):
+    def combined(self, module_name, seq_tag_id, per_frame):
         """Return the combined error for errors from shared and per-frame groups
         for the given module.
 
@@ -45,188 +67,393 @@ class FunctionalGroupInfo:
         ----------
         module_name : str
             The name of the validated macro module.
-        seq_tag : str
-            The tag ID string of the top-level-sequence tag in the macro
+        seq_tag_id : int
+            The tag ID of the top-level-sequence tag in the macro
         per_frame : dict
             The errors from validation of the module in the per-frame group.
         """
-        result = {}
-        shared = self.shared_results.get(module_name)
+        shared = self.shared_results[module_name]
         if not shared and not per_frame:
             # the module is present in both shared and per-frame groups
             # this is an error
-            return {
-                f"Tag {seq_tag} is present in both Shared and Per Frame "
-                f"Functional Groups": [seq_tag]
-            }
+            return {TagError(seq_tag_id, ErrorKind.InBothGroups): None}
+        result = {}
+        per_frame = dict(per_frame)
         for error in shared:
             # similar errors differ by the functional group tag
-            per_frame_error = error.replace("(5200,9229)", "(5200,9230)")
+            per_frame_error = error.in_sequence(
+                SHARED_GROUPS_TAG_ID, PER_FRAME_GROUPS_TAG_ID
+            )
             if per_frame_error in per_frame:
                 # if the error appears in both sequences, it is real
-                result[error] = shared[error]
+                result[error] = None
                 del per_frame[per_frame_error]
-            elif "missing" in error:
+            elif error.kind == ErrorKind.Missing:
                 # for missing tags, we also have to check if the error does not appear
                 # in the per-frame group because it is part of a missing sequence
-                for per_frame_error in per_frame:
-                    # the handling via the message is ugly and shall be replaced by
-                    # more concise data structs later...
-                    parts = per_frame_error.split(" > ")
-                    if shared[error][0] in parts[1:]:
-                        result[per_frame_error] = per_frame[per_frame_error]
-                        del per_frame[per_frame_error]
-                        break
+                for nested_error in self._nested_errors(error, per_frame):
+                    result[nested_error] = None
+                    del per_frame[nested_error]
             else:
                 # other errors (unexpected tag, missing value) shall always remain
-                result[error] = per_frame[error]
+                result[error] = None
 
         for error in per_frame:
-            if "missing" in error:
+            if error.kind == ErrorKind.Missing:
                 # same check as above
-                for shared_error in shared:
-                    parts = shared_error.split(" > ")
-                    if per_frame[error][0] in parts[1:]:
-                        result[shared_error] = shared[shared_error]
-                        del shared[shared_error]
-                        break
+                for nested_error in self._nested_errors(error, shared):
+                    result[nested_error] = None
             else:
-                result[error] = per_frame[error]
+                result[error] = None
         return result
 
+    @staticmethod
+    def _nested_errors(error, errors):
+        """Return the errors inside the sequence the given error refers to."""
+        return [
+            nested_error
+            for nested_error in errors
+            if error.tag_id in nested_error.sequence_tag_ids
+        ]
+
+
+class ValueCheck:
+    """The value check of a tag in a per-frame functional group item,
+    that can be repeated for other items with the same structure.
+
+    Attributes:
+        path: tuple[tuple[int, int], ...]
+            The sequence tag IDs and item indexes leading from the per-frame item
+            to the dataset containing the tag.
+        tag_id: int
+            The ID of the checked tag.
+        attribute: AttributeInfo
+            The compiled attribute information of the tag.
+        condition: CompiledCondition | None
+            The condition of the tag used in the error message.
+        module: str
+            The name of the module containing the functional groups.
+    """
+
+    __slots__ = ("path", "tag_id", "attribute", "condition", "module")
+
+    def __init__(self, path, tag_id, attribute, condition, module):
+        self.path = path
+        self.tag_id = tag_id
+        self.attribute = attribute
+        self.condition = condition
+        self.module = module
+
+    def data_element(self, item):
+        """Return the checked data element in the given per-frame item."""
+        dataset = item
+        for seq_tag_id, index in self.path:
+            dataset = dataset[seq_tag_id].value[index]
+        return dataset[self.tag_id]
+
+
+class StructureResult:
+    """The validation result of a dataset, that can be reused for other
+    datasets with the same structure (see `IODValidator._item_structure`).
+
+    Attributes:
+        error_records: dict
+            The error records of the validated dataset.
+        value_checks: list[tuple[tuple[tuple[int, int], ...], int, AttributeInfo]]
+            The path to the containing dataset, the tag ID and the attribute
+            information of each value check done in the validated dataset.
+        value_results: list[tuple[ErrorKind | None, str]]
+            The results of the value checks, in the same order.
+    """
+
+    __slots__ = ("error_records", "value_checks", "value_results")
+
+    def __init__(self):
+        self.error_records = {}
+        self.value_checks = []
+        self.value_results = []
+
 
 @dataclass
 class DicomInfo:
     dictionary: dict
     iods: dict
     modules: dict
+    _plan_compiler: ValidationPlanCompiler = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._plan_compiler = ValidationPlanCompiler(self.iods, self.modules)
+
+    def validation_plan(self, sop_class_uid):
+        """Return the compiled validation plan for the given SOP class.
+        The plan is compiled on first access and shared by all validators
+        using this DICOM information.
+        """
+        return self._plan_compiler.plan(sop_class_uid)
 
 
 class InvalidParameterError(Exception):
     pass
 
 
+def log_errors(logger, errors):
+    """Output the given error messages of a validated dataset.
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        The logger used for the output.
+    errors : dict
+        The error messages by module name, as returned by
+        `IODValidator.validate`.
+    """
+    if "fatal" in errors:
+        logger.error("%s - aborting", errors["fatal"])
+    elif errors:
+        logger.info("\nErrors\n======")
+        for module_name, module_errors in errors.items():
+            title = "General:" if module_name == "Root" else f'Module "{module_name}":'
+            logger.warning(title)
+            for error_msg in module_errors:
+                logger.warning(error_msg)
+            logger.warning("")
+
+
 class IODValidator:
+    """Validates a dataset against the IOD of its SOP class.
+
+    Parameters
+    ----------
+    dataset : Dataset
+        The dataset to be validated.
+    dicom_info : DicomInfo
+        The DICOM information read from the standard.
+    log_level : int
+        The log level used for validation output.
+    suppress_vr_warnings : bool
+        If True, values are not checked against their VR.
+    structure_results : dict | None
+        If given, the validation results are stored here by dataset
+        structure, and reused for datasets with the same structure and
+        the same value check results. The dictionary can be shared between
+        validators using the same DICOM information and settings.
+        Datasets with more than `max_structure_frames` per-frame functional
+        group items are always validated, as all items have to be read and
+        checked anyway, so that reusing the result would not be faster.
+    """
+
+    # the maximum number of results in `structure_results`
+    max_structure_results = 64
+    # the maximum number of per-frame functional group items in datasets
+    # for which `structure_results` are used
+    max_structure_frames = 32
+
     def __init__(
-        self, dataset, dicom_info, log_level=logging.INFO, suppress_vr_warnings=False
+        self,
+        dataset,
+        dicom_info,
+        log_level=logging.INFO,
+        suppress_vr_warnings=False,
+        structure_results=None,
     ):
-        self._dataset = dataset
-        self._dataset_stack = [DatasetStackItem(self._dataset, None)]
         self._dicom_info = dicom_info
-        self._func_group_info = FunctionalGroupInfo({}, set())
         self._suppress_vr_warnings = suppress_vr_warnings
-        self.errors = {}
+        self._structure_results = structure_results
         self.logger = logging.getLogger("validator")
         self.logger.level = log_level
         if not self.logger.hasHandlers():
             self.logger.addHandler(logging.StreamHandler(sys.stdout))
+        self.reset(dataset)
+
+    def reset(self, dataset):
+        """Prepare the validator for the validation of another dataset.
+        This allows to reuse the validator for several datasets.
+
+        Parameters
+        ----------
+        dataset : Dataset
+            The dataset to be validated next.
+        """
+        self._dataset = dataset
+        self._dataset_stack = [DatasetStackItem(self._dataset, None)]
+        self._func_group_info = FunctionalGroupInfo({}, {}, {})
+        # the value checks collected while validating a per-frame item,
+        # None if values are checked immediately
+        self._value_checks = None
+        self._per_frame_path_length = 0
+        self._condition_tag_ids = set()
+        # the structure result recorded while validating the dataset, if any
+        self._structure_result = None
+        # the structures of the sequence items in the dataset by item ID,
+        # so that each item is only described once per validation
+        self._item_structures = {}
+        self.errors = {}
+        self.error_records = {}
+        # the output is only created in `validate`
+        self._log = False
+        self._log_debug = False
 
     def validate(self):
         """Validates current dataset.
         All errors are shown in the console output, and are also contained
         in the `errors` dictionary after execution.
+        The errors are additionally available as `TagError` records by module
+        name in `error_records`.
+        """
+        self._validate(log=True)
+        self.errors = error_messages(self.error_records, self._dicom_info.dictionary)
+        log_errors(self.logger, self.errors)
+        return self.errors
+
+    def validate_records(self):
+        """Validates current dataset without any output.
+        Contrary to `validate`, nothing is logged and no error messages are
+        created; they can be created on demand using `error_messages`.
+
+        Returns
+        -------
+        dict
+            The `TagError` records by module name, or the message of a
+            fatal error with the key "fatal".
         """
+        self._validate(log=False)
+        return self.error_records
+
+    def _validate(self, log):
         self.errors = {}
+        self.error_records = {}
+        self._log = log
+        self._log_debug = log and self.logger.isEnabledFor(logging.DEBUG)
+        self._item_structures = {}
         if "SOPClassUID" not in self._dataset:
-            self.errors["fatal"] = "Missing SOPClassUID"
+            self.error_records["fatal"] = "Missing SOPClassUID"
         else:
             sop_class_uid = self._dataset.SOPClassUID
             if sop_class_uid not in self._dicom_info.iods:
-                self.errors["fatal"] = (
+                self.error_records["fatal"] = (
                     f"Unknown SOPClassUID " f"(probably retired): {sop_class_uid}"
                 )
             else:
                 self._validate_sop_class(sop_class_uid)
-        if "fatal" in self.errors:
-            self.logger.error("%s - aborting", self.errors["fatal"])
-        else:
-            if self.errors:
-                self.logger.info("\nErrors\n======")
-                for module_name, errors in self.errors.items():
-                    title = (
-                        "General:"
-                        if module_name == "Root"
-                        else f'Module "{module_name}":'
-                    )
-                    self.logger.warning(title)
-                    for error_msg in errors:
-                        self.logger.warning(error_msg)
-                    self.logger.warning("")
-        return self.errors
 
     def _validate_sop_class(self, sop_class_uid):
         """Validate the dataset against the given SOP class.
-        Record all errors in the `errors` attribute.
+        Record all errors in the `error_records` attribute.
 
         Parameters
         ----------
         sop_class_uid : str
             The SOP Class UID of the dataset.
         """
-        iod_info = self._dicom_info.iods[sop_class_uid]
-
-        self.logger.info('SOP class is "%s" (%s)', sop_class_uid, iod_info["title"])
-        self.logger.debug("Checking modules for SOP Class")
-        self.logger.debug("------------------------------")
-
-        maybe_existing_modules = self._get_maybe_existing_modules(iod_info["modules"])
-
-        for module_name, module in iod_info["modules"].items():
-            self._dataset_stack[-1].name = module_name
-            errors = self._validate_module(
-                module, module_name, maybe_existing_modules, iod_info["group_macros"]
-            )
+        plan = self._dicom_info.validation_plan(sop_class_uid)
+        self._condition_tag_ids = plan.condition_tag_ids
+
+        if self._log:
+            self.logger.info('SOP class is "%s" (%s)', sop_class_uid, plan.title)
+        structure_key = None
+        if self._uses_structure_results():
+            structure_key = sop_class_uid, self._item_structure(self._dataset)
+            if self._reuse_structure_result(structure_key):
+                return
+            self._structure_result = StructureResult()
+
+        if self._log_debug:
+            self.logger.debug("Checking modules for SOP Class")
+            self.logger.debug("------------------------------")
+
+        maybe_existing_modules = self._get_maybe_existing_modules(plan.modules)
+
+        for module in plan.modules:
+            self._dataset_stack[-1].name = module.name
+            errors = self._validate_module(module, maybe_existing_modules)
             if errors:
-                self.errors[module_name] = errors
+                self.error_records[module.name] = errors
 
         if len(self._dataset_stack[-1].unexpected_tags) != 0:
-            self.errors["Root"] = self._unexpected_tag_errors()
+            self.error_records["Root"] = self._unexpected_tag_errors()
+
+        if structure_key is not None:
+            self._store_structure_result(structure_key)
+
+    def _uses_structure_results(self):
+        if self._structure_results is None or self._log_debug:
+            return False
+        per_frame_groups = self._dataset.get(PER_FRAME_GROUPS_TAG_ID)
+        return (
+            per_frame_groups is None
+            or len(per_frame_groups.value or ()) <= self.max_structure_frames
+        )
 
-    def _validate_module(
-        self, module, module_name, maybe_existing_modules, group_macros=None
-    ):
+    def _reuse_structure_result(self, structure_key):
+        """Use the stored result of a dataset with the same structure,
+        if the value checks done for that dataset give the same results
+        for the current dataset.
+        Return True if the result could be reused.
+        """
+        structure_result = self._structure_results.get(structure_key)
+        if structure_result is None:
+            return False
+        for (path, tag_id, attribute), value_result in zip(
+            structure_result.value_checks, structure_result.value_results
+        ):
+            dataset = self._dataset
+            for seq_tag_id, index in path:
+                dataset = dataset[seq_tag_id].value[index]
+            if self._value_error(dataset[tag_id], attribute) != value_result:
+                return False
+        self.error_records = {
+            module_name: dict(errors)
+            for module_name, errors in structure_result.error_records.items()
+        }
+        return True
+
+    def _store_structure_result(self, structure_key):
+        structure_result = self._structure_result
+        self._structure_result = None
+        structure_result.error_records = {
+            module_name: dict(errors)
+            for module_name, errors in self.error_records.items()
+        }
+        results = self._structure_results
+        if structure_key not in results and len(results) >= self.max_structure_results:
+            # remove the oldest result
+            del results[next(iter(results))]
+        results[structure_key] = structure_result
+
+    def _validate_module(self, module, maybe_existing_modules):
         """Validate the given module.
 
         Parameters
         ----------
-        module : dict
-            Contains the module reference chapter ("ref"), the usage ("use"),
-            and optionally the usage condition as a dictionary (see `Condition`).
-        module_name : str
-            The module name as listed in the standard.
+        module : ModulePlan
+            Contains the module name, the module reference chapter, the usage,
+            the optional usage condition, and the compiled module attributes.
         maybe_existing_modules : dict[set]
             List of module references with contained tags that may be present
             in the dataset. Due to the fact that the same tag may belong to
             different modules, the presence of the module is only guessed at this point,
             and some of them may not actually be present.
-        group_macros : dict[dict]
-            The modules allowed in functional group sequences, if the given module
-            contains them, otherwise an empty dictionary.
-            The keys are the module names, the values the module dicts as described
-            for `module`.
-            None if `module` itself is a module in a functional group.
 
         Returns
         -------
         The dictionary of found errors.
         """
-        usage = module["use"]
-        module_info = self._get_module_info(module["ref"], group_macros)
-        condition = module["cond"] if "cond" in module else None
+        usage = module.use
+        module_info = self._resolved(module.attributes)
+        condition = module.cond
         is_shared = False
         is_per_frame = False
-        if group_macros is None:
-            if module_name in self._func_group_info.checked_modules:
-                # check only one per-frame item
-                return {}
+        if module.is_group_macro:
             is_shared = self._in_shared_group
             if not is_shared:
                 is_per_frame = self._in_per_frame_group
 
         allowed = True
-        if condition and "F" in condition["type"] and is_shared:
+        if condition and "F" in condition.type and is_shared:
             required, allowed = False, False
-        elif condition and "S" in condition["type"] and is_per_frame:
+        elif condition and "S" in condition.type and is_per_frame:
             required, allowed = False, False
         elif usage[0] == "M":
             required = True
@@ -235,31 +462,34 @@ class IODValidator:
 
         else:
             required, allowed = self._object_is_required_or_allowed(condition)
-        if group_macros is not None:
-            self._log_module_required(module_name, required, allowed, condition)
+        if self._log_debug and not module.is_group_macro:
+            self._log_module_required(module.name, required, allowed, condition)
 
         if required:
             # Always validate required modules.
             # If the module is missing from the dataset the validation
             # should report it as an error.
             result = self._validate_attributes(module_info, False)
-            if group_macros is not None:
+            if not module.is_group_macro:
                 return result
 
             # for functional groups, we need to check both shared and per-frame groups
             # to get a result; a required module should be in only one of these
             if is_shared:
                 # just save the result to check together with per-frame groups
-                self._func_group_info.shared_results[module_name] = result
+                self._func_group_info.shared_results[module.name] = result
                 return {}
             if is_per_frame:
-                shared_result = self._func_group_info.shared_results.get(module_name)
-                if shared_result is not None:
-                    seq_tag = list(module_info.keys())[0]
-                    return self._func_group_info.combined(module_name, seq_tag, result)
-                return result
+                # the result is combined with the shared group result
+                # after checking the values of all per-frame items
+                seq_tag_id = next(iter(module_info.attributes))
+                self._func_group_info.per_frame_results[module.name] = (
+                    seq_tag_id,
+                    result,
+                )
+                return {}
 
-        if module["ref"] not in maybe_existing_modules:
+        if module.ref not in maybe_existing_modules:
             # The module is not present at all in the dataset.
             # No validation is needed.
             return {}
@@ -270,34 +500,32 @@ class IODValidator:
         # So, let's see if it exists "strongly" enough to be considered
         # for further checks.
         if maybe_existing_modules and not self._does_module_strongly_exist(
-            module["ref"], maybe_existing_modules
+            module.ref, maybe_existing_modules
         ):
             return {}
 
         if not allowed:
             # no special case for functional groups here
             errors = {}
-            for tag_id_string in module_info:
-                tag_id = self._tag_id(tag_id_string)
-                if tag_id in self._dataset_stack[-1].dataset:
-                    message = self._incorrect_tag_message(tag_id, "not allowed")
-                    errors.setdefault(message, []).append(tag_id_string)
+            for tag_id, attribute in module_info.attributes.items():
+                if tag_id in self._dataset_stack[-1].tags:
+                    errors[self._tag_error(tag_id, ErrorKind.NotAllowed)] = None
             return errors
         return self._validate_attributes(module_info, False)
 
     @property
     def _in_per_frame_group(self):
-        return self._dataset_stack[-1].name == "(5200,9230)"
+        return self._dataset_stack[-1].name == PER_FRAME_GROUPS
 
     @property
     def _in_shared_group(self):
-        return self._dataset_stack[-1].name == "(5200,9229)"
+        return self._dataset_stack[-1].name == SHARED_GROUPS
 
     def _validate_attributes(self, attributes, report_unexpected_tags):
         """Validate the given attributes according to their type.
         Parameters
         ----------
-        attributes : dict
+        attributes : AttributeTable
             The attributes of a single module to be validated.
         report_unexpected_tags : bool
             If True, tags that are not expected are reported and placed into
@@ -309,46 +537,226 @@ class IODValidator:
         """
         errors = {}
 
-        for tag_id_string, attribute in attributes.items():
-            if tag_id_string == "modules":
-                self._validate_func_group_modules(attribute)
-            else:
-                tag_id = self._tag_id(tag_id_string)
-
-                result = self._validate_attribute(tag_id, attribute)
-                if result is not None:
-                    errors.setdefault(result, []).append(tag_id_string)
-
-                self._dataset_stack[-1].unexpected_tags.discard(tag_id)
-
-                if "items" in attribute:
-                    data_elem = self._dataset_stack[-1].dataset.get_item(tag_id)
-                    if data_elem is None:
-                        continue
-                    if data_elem.VR != "SQ":
-                        raise RuntimeError(f"Not a sequence: {data_elem}")
-                    for sq_item_dataset in data_elem.value:
-                        self._dataset_stack.append(
-                            DatasetStackItem(sq_item_dataset, tag_id_string)
+        for tag_id, attribute in attributes.attributes.items():
+            result = self._validate_attribute(tag_id, attribute)
+            if result is not None:
+                errors[result] = None
+
+            self._dataset_stack[-1].unexpected_tags.discard(tag_id)
+
+            if attribute.items is not None:
+                stack_item = self._dataset_stack[-1]
+                data_elem = stack_item.dataset.get_item(tag_id)
+                if data_elem is None:
+                    continue
+                if data_elem.VR != "SQ":
+                    raise RuntimeError(f"Not a sequence: {data_elem}")
+                if attribute.tag_id_string == PER_FRAME_GROUPS:
+                    errors.update(self._validate_per_frame_items(attribute, data_elem))
+                    continue
+                for index, sq_item_dataset in enumerate(data_elem.value):
+                    self._dataset_stack.append(
+                        DatasetStackItem(
+                            sq_item_dataset,
+                            attribute.tag_id_string,
+                            stack_item.path + ((tag_id, index),),
                         )
-                        errors.update(
-                            self._validate_attributes(attribute["items"], True)
-                        )
-                        self._dataset_stack.pop()
+                    )
+                    errors.update(self._validate_attributes(attribute.items, True))
+                    self._dataset_stack.pop()
+
+        if attributes.group_macros is not None:
+            self._validate_func_group_modules(attributes.group_macros)
 
         if report_unexpected_tags:
             errors.update(self._unexpected_tag_errors())
 
         return errors
 
+    def _validate_per_frame_items(self, attribute, data_elem):
+        """Validate the items of the Per-Frame Functional Groups Sequence.
+        Items with the same structure (see `_item_structure`) only differ
+        in values that are not checked in conditions, so the validation of
+        the modules in these items gives the same result apart from invalid
+        values. Therefore only the first item with a given structure is fully
+        validated, while for all items only the value checks are done.
+
+        Parameters
+        ----------
+        attribute : AttributeInfo
+            The compiled information of the Per-Frame Functional Groups Sequence.
+        data_elem : DataElement
+            The Per-Frame Functional Groups Sequence element.
+
+        Returns
+        -------
+        The dictionary of found errors outside of the macro modules.
+        """
+        stack_item = self._dataset_stack[-1]
+        items_by_structure = {}
+        for index, item in enumerate(data_elem.value):
+            items_by_structure.setdefault(
+                self._sequence_item_structure(item), []
+            ).append((index, item))
+
+        errors = {}
+        for items in items_by_structure.values():
+            index, item = items[0]
+            path = stack_item.path + ((attribute.tag_id, index),)
+            self._dataset_stack.append(
+                DatasetStackItem(item, attribute.tag_id_string, path)
+            )
+            self._per_frame_path_length = len(path)
+            self._func_group_info.clear_per_frame()
+            self._value_checks = []
+            errors.update(self._validate_attributes(attribute.items, True))
+            item_value_checks = self._value_checks
+            self._value_checks = None
+            self._dataset_stack.pop()
+
+            items = [
+                (stack_item.path + ((attribute.tag_id, index),), item)
+                for index, item in items
+            ]
+            if item_value_checks:
+                for item_path, item in items:
+                    errors.update(
+                        self._value_errors(item_path, item, item_value_checks)
+                    )
+            self._add_per_frame_module_errors(items)
+        return errors
+
+    def _add_per_frame_module_errors(self, items):
+        """Add the errors of the macro modules for the given per-frame items
+        with the same structure, given with their paths, to the errors.
+        The result of the validated item is combined with the value errors
+        of each item, and with the result of the shared functional group
+        for required modules.
+        """
+        func_group_info = self._func_group_info
+        for module_name, value_checks in func_group_info.value_checks.items():
+            seq_tag_id, result = func_group_info.per_frame_results[module_name]
+            combine = (
+                seq_tag_id is not None and module_name in func_group_info.shared_results
+            )
+            checked_value_errors = set()
+            # without value checks, all items give the same result
+            for item_path, item in items if value_checks else items[:1]:
+                value_errors = self._value_errors(item_path, item, value_checks)
+                # items with the same value errors give the same result
+                key = tuple(value_errors)
+                if key in checked_value_errors:
+                    continue
+                checked_value_errors.add(key)
+                errors = dict(result)
+                errors.update(value_errors)
+                if combine:
+                    errors = func_group_info.combined(module_name, seq_tag_id, errors)
+                if errors:
+                    self.error_records.setdefault(module_name, {}).update(errors)
+
+    def _value_errors(self, item_path, item, value_checks):
+        """Return the errors for invalid values in the given per-frame item
+        with the given path."""
+        errors = {}
+        for value_check in value_checks:
+            data_elem = value_check.data_element(item)
+            path = item_path + value_check.path
+            error_kind, extra_msg = self._checked_value_error(
+                path, data_elem, value_check.attribute
+            )
+            if error_kind is not None:
+                error = TagError(
+                    value_check.tag_id,
+                    error_kind,
+                    value_check.module,
+                    path,
+                    value_check.condition,
+                    extra_msg,
+                )
+                errors[error] = None
+        return errors
+
+    def _item_structure(self, dataset):
+        """Return a hashable description of the structure of the given dataset.
+        This contains the tag IDs, VRs and information about empty values of
+        all contained data elements, and the values of data elements checked
+        in conditions. Datasets with the same structure may only differ
+        in the results of value checks.
+        Only sequences and data elements checked in conditions are converted,
+        other data elements that have not been read yet are described by
+        their raw VR and value length.
+        """
+        structure = []
+        for tag in dataset.keys():
+            if tag.is_private or tag >= 0x7FE00010:
+                # these tags are not validated, avoid reading their values
+                structure.append((tag,))
+                continue
+            data_elem = dataset.get_item(tag)
+            if isinstance(data_elem, RawDataElement):
+                if tag not in self._condition_tag_ids and not self._is_raw_sequence(
+                    data_elem
+                ):
+                    # marked as raw, as the VR may differ from the converted one
+                    structure.append((tag, "raw", data_elem.VR, data_elem.length == 0))
+                    continue
+                data_elem = dataset[tag]
+            value = data_elem.value
+            if data_elem.VR == "SQ":
+                value = tuple(self._sequence_item_structure(item) for item in value)
+            elif tag in self._condition_tag_ids:
+                if isinstance(value, MultiValue):
+                    value = tuple(value)
+                try:
+                    hash(value)
+                except TypeError:
+                    value = repr(value)
+            else:
+                value = value is None
+            structure.append((tag, data_elem.VR, value))
+        return tuple(structure)
+
+    def _sequence_item_structure(self, item):
+        """Return the structure of the given sequence item (see `_item_structure`),
+        which is only determined once per validation."""
+        structure = self._item_structures.get(id(item))
+        if structure is None:
+            structure = self._item_structures[id(item)] = self._item_structure(item)
+        return structure
+
+    @staticmethod
+    def _is_raw_sequence(data_elem):
+        """Return True if the given raw data element is a sequence.
+        In implicit VR datasets, the VR is taken from the dictionary."""
+        vr = data_elem.VR
+        if vr is None:
+            try:
+                vr = dictionary_VR(data_elem.tag)
+            except KeyError:
+                return False
+        return vr == "SQ"
+
     def _validate_func_group_modules(self, modules):
         if self._in_shared_group:
             self._func_group_info.clear()
+        in_per_frame_group = self._in_per_frame_group
+        item_value_checks = self._value_checks
         maybe_existing_modules = self._get_maybe_existing_modules(modules)
-        for module_name, module in modules.items():
-            errors = self._validate_module(module, module_name, maybe_existing_modules)
-            if errors:
-                self.errors.setdefault(module_name, {}).update(errors)
+        for module in modules:
+            if in_per_frame_group:
+                self._value_checks = self._func_group_info.value_checks[module.name] = (
+                    []
+                )
+            errors = self._validate_module(module, maybe_existing_modules)
+            if in_per_frame_group:
+                # the errors are added after checking all items with the same structure
+                self._func_group_info.per_frame_results.setdefault(
+                    module.name, (None, errors)
+                )
+            elif errors:
+                self.error_records.setdefault(module.name, {}).update(errors)
+        self._value_checks = item_value_checks
 
     def _validate_attribute(self, tag_id, attribute):
         """Validate a single DICOM attribute according to its type.
@@ -357,28 +765,30 @@ class IODValidator:
         ----------
         tag_id : int
             The tag ID of the attribute.
-        attribute : dict
-            Contains the attribute type ("type"), and the optional condition ("cond")
-            for the presence of the attribute (see `Condition`).
+        attribute : AttributeInfo
+            Contains the attribute type, the optional condition
+            for the presence of the attribute (see `Condition`),
+            and the optional enumerated values.
 
         Returns
         -------
         The dictionary of found errors.
         """
-        attribute_type = attribute["type"]
+        attribute_type = attribute.type
         # ignore image data and larger tags for now - we don't read them
         if tag_id >= 0x7FE00010:
             return
-        has_tag = tag_id in self._dataset_stack[-1].dataset
+        stack_item = self._dataset_stack[-1]
+        has_tag = tag_id in stack_item.tags
         value_required = attribute_type in ("1", "1C")
-        condition_dict = None
+        condition = None
         if attribute_type in ("1", "2"):
             tag_required, tag_allowed = True, True
         elif attribute_type in ("1C", "2C"):
-            if "cond" in attribute:
-                condition_dict = attribute["cond"]
+            if attribute.cond is not None:
+                condition = attribute.cond
                 tag_required, tag_allowed = self._object_is_required_or_allowed(
-                    condition_dict
+                    condition
                 )
             else:
                 tag_required, tag_allowed = False, True
@@ -387,42 +797,82 @@ class IODValidator:
         error_kind = None
         extra_msg = ""
         if not has_tag and tag_required:
-            error_kind = "missing"
+            error_kind = ErrorKind.Missing
         elif has_tag and not tag_allowed:
-            error_kind = "not allowed"
+            error_kind = ErrorKind.NotAllowed
         elif has_tag:
-            value = self._dataset_stack[-1].dataset[tag_id].value
-            vr = self._dataset_stack[-1].dataset[tag_id].VR
-            if value_required:
-                if value is None or isinstance(value, Sequence) and not value:
-                    error_kind = "empty"
-            if value is not None:
-                if not isinstance(value, MultiValue):
-                    value = [value]
-                for i, v in enumerate(value):
-                    if "enums" in attribute:
-                        for enums in attribute["enums"]:
-                            # if an index is there, we only check the value for the
-                            # correct index; otherwise there will only be one entry
-                            if "index" in enums and int(enums["index"]) != i + 1:
-                                continue
-                            if v not in enums["val"]:
-                                error_kind = "value is not allowed"
-                                extra_msg = (
-                                    f" (value: {v}, allowed: "
-                                    f"{', '.join([str(e) for e in enums['val']])})"
-                                )
-                    if not self._suppress_vr_warnings and error_kind is None:
-                        vv = str(v) if vr in ("DS", "IS") else v
-                        try:
-                            validate_value(vr, vv, config.RAISE)
-                        except Exception as _:
-                            error_kind = "conflicting with VR"
-                            extra_msg = f" (value: {vv}, VR: {vr})"
+            data_elem = stack_item.dataset[tag_id]
+            value = data_elem.value
+            if value_required and (
+                value is None or isinstance(value, Sequence) and not value
+            ):
+                error_kind = ErrorKind.Empty
+            elif self._value_checks is not None:
+                # in a per-frame item, the values are checked separately
+                self._value_checks.append(
+                    ValueCheck(
+                        stack_item.path[self._per_frame_path_length :],
+                        tag_id,
+                        attribute,
+                        condition,
+                        self._dataset_stack[0].name,
+                    )
+                )
+            else:
+                error_kind, extra_msg = self._checked_value_error(
+                    stack_item.path, data_elem, attribute
+                )
 
         if error_kind is not None:
-            extra_msg = extra_msg or self._condition_message(condition_dict)
-            return self._incorrect_tag_message(tag_id, error_kind, extra_msg)
+            return self._tag_error(tag_id, error_kind, condition, extra_msg)
+
+    def _checked_value_error(self, path, data_elem, attribute):
+        """Return the result of `_value_error` for the data element in the
+        dataset with the given path, and record the check if needed."""
+        result = self._value_error(data_elem, attribute)
+        if self._structure_result is not None:
+            self._structure_result.value_checks.append((path, data_elem.tag, attribute))
+            self._structure_result.value_results.append(result)
+        return result
+
+    def _value_error(self, data_elem, attribute):
+        """Check the value of the given data element against the enumerated
+        values of the attribute and against its VR.
+
+        Returns
+        -------
+        tuple(ErrorKind | None, str)
+            The error kind and the error message details, or None and an empty
+            string if the value is valid.
+        """
+        error_kind = None
+        extra_msg = ""
+        value = data_elem.value
+        vr = data_elem.VR
+        if value is not None:
+            if not isinstance(value, MultiValue):
+                value = [value]
+            for i, v in enumerate(value):
+                if attribute.enums is not None:
+                    for enums in attribute.enums:
+                        # if an index is there, we only check the value for the
+                        # correct index; otherwise there will only be one entry
+                        if "index" in enums and int(enums["index"]) != i + 1:
+                            continue
+                        if v not in enums["val"]:
+                            error_kind = ErrorKind.InvalidValue
+                            extra_msg = (
+                                f" (value: {v}, allowed: "
+                                f"{', '.join([str(e) for e in enums['val']])})"
+                            )
+                if not self._suppress_vr_warnings and error_kind is None:
+                    vv = str(v) if vr in ("DS", "IS") else v
+                    try:
+                        validate_value(vr, vv, config.RAISE)
+                    except Exception as _:
+                        error_kind = ErrorKind.ConflictingVR
+                        extra_msg = f" (value: {vv}, VR: {vr})"
+        return error_kind, extra_msg
 
     def _object_is_required_or_allowed(self, condition):
         """Checks if an attribute is required or allowed in the current dataset,
@@ -430,9 +880,9 @@ class IODValidator:
 
         Parameters
         ----------
-        condition : str | Condition
-            The condition or serialized condition defining if the object shall or
-            may be present.
+        condition : CompiledCondition
+            The condition defining if the object shall or may be present.
+            The result is cached for the current dataset.
 
         Returns
         -------
@@ -443,83 +893,12 @@ class IODValidator:
             False, True: the attribute is allowed but not required
             False, False: the attribute is not allowed.
         """
-        if isinstance(condition, str):
-            condition = json.loads(condition)
-        if ConditionType(condition["type"]).user_defined:
-            return False, True
-        required = self._composite_object_is_required(condition)
-        if required:
-            return True, True
-        allowed = (
-            condition["type"] == ConditionType.MandatoryOrUserDefined
-            or condition["type"] == ConditionType.MandatoryOrConditional
-            and self._composite_object_is_required(condition["other_cond"])
-        )
-        return False, allowed
-
-    def _composite_object_is_required(self, condition):
-        """Checks if an attribute with a composite condition is required or allowed
-         in the current dataset.
-
-        Parameters
-        ----------
-        condition : dict
-            The condition dict defining if the object shall be present.
-
-        Returns
-        -------
-        bool
-            `True` if the attribute is required in the dataset.
-        """
-        if "and" in condition:
-            required = all(
-                self._composite_object_is_required(cond) for cond in condition["and"]
-            )
-        elif "or" in condition:
-            required = any(
-                self._composite_object_is_required(cond) for cond in condition["or"]
-            )
-        else:
-            required = self._object_is_required(condition)
-        return required
-
-    def _object_is_required(self, condition):
-        """Checks if an attribute is required in the current dataset,
-         depending on the given condition.
-
-        Parameters
-        ----------
-        condition : dict
-            The condition dict defining if the object shall be present.
-
-        Returns
-        -------
-        bool
-            `True` if the attribute is required in the dataset.
-        """
-        tag_id = self._tag_id(condition["tag"])
-        tag_value = None
-        operator = condition["op"]
-        if operator == ConditionOperator.Present:
-            return self._tag_exists(tag_id)
-        elif operator == ConditionOperator.Absent:
-            return not self._tag_exists(tag_id)
-        elif self._tag_exists(tag_id):
-            tag = self._lookup_tag(tag_id)
-            index = condition["index"]
-            if index > 0:
-                if index <= tag.VM:
-                    tag_value = tag.value[index - 1]
-            elif tag.VM > 1:
-                tag_value = tag.value[0]
-            else:
-                tag_value = tag.value
-            if tag_value is None:
-                return False
-            if operator == ConditionOperator.NotEmpty:
-                return True
-            return self._tag_matches(tag_value, operator, condition["values"])
-        return False
+        results = self._dataset_stack[-1].condition_results
+        result = results.get(condition.key)
+        if result is None:
+            result = condition.evaluate(self._lookup_tag)
+            results[condition.key] = result
+        return result
 
     #
     # Get all the modules that have at least one tag/attribute present
@@ -535,11 +914,11 @@ class IODValidator:
     #
     def _get_maybe_existing_modules(self, modules):
         maybe_existing_modules = {}
-        for module in modules.values():
-            module_info = self._get_module_info(module["ref"])
+        for module in modules:
+            module_info = self._resolved(module.attributes)
             existing_tags = self._get_existing_tags_of_module(module_info)
             if len(existing_tags) != 0:
-                maybe_existing_modules[module["ref"]] = existing_tags
+                maybe_existing_modules[module.ref] = existing_tags
         return maybe_existing_modules
 
     #
@@ -559,119 +938,44 @@ class IODValidator:
         return True
 
     def _get_existing_tags_of_module(self, module_info):
-        existing_tag_ids = set()
-        for tag_id_string in module_info:
-            tag_id = self._tag_id(tag_id_string)
-            if tag_id in self._dataset_stack[-1].dataset:
-                existing_tag_ids.add(tag_id)
-        return existing_tag_ids
+        dataset_tags = self._dataset_stack[-1].tags
+        return {tag_id for tag_id in module_info.attributes if tag_id in dataset_tags}
 
     def _lookup_tag(self, tag_id):
         for stack_item in reversed(self._dataset_stack):
-            if tag_id in stack_item.dataset:
+            if tag_id in stack_item.tags:
                 return stack_item.dataset[tag_id]
         return None
 
-    def _tag_exists(self, tag_id):
-        return self._lookup_tag(tag_id) is not None
-
-    @staticmethod
-    def _tag_id(tag_id_string):
-        group, element = tag_id_string[1:-1].split(",")
-        # workaround for repeating tags -> special handling needed
-        if group.endswith("xx"):
-            group = group[:2] + "00"
-        return (int(group, 16) << 16) + int(element, 16)
-
-    @staticmethod
-    def _tag_id_string(tag_id):
-        tag = Tag(tag_id)
-        return str(tag).replace(" ", "")
-
-    @staticmethod
-    def _tag_matches(tag_value, operator, values):
-        values = [type(tag_value)(value) for value in values]
-        if operator == ConditionOperator.EqualsValue:
-            return tag_value in values
-        if operator == ConditionOperator.NotEqualsValue:
-            return tag_value not in values
-        if operator == ConditionOperator.GreaterValue:
-            return tag_value > values[0]
-        if operator == ConditionOperator.LessValue:
-            return tag_value < values[0]
-        if operator == ConditionOperator.EqualsTag:
-            return tag_value in values
-        return False
-
-    def _get_module_info(self, module_ref, group_macros=None):
-        return self._expanded_module_info(
-            self._dicom_info.modules[module_ref], group_macros
+    def _resolved(self, attributes):
+        """Return the attribute table with all conditional includes
+        evaluated for the current dataset."""
+        if attributes.is_static:
+            return attributes
+        return attributes.resolved(
+            lambda condition: self._object_is_required_or_allowed(condition)[0]
         )
 
-    def _expanded_module_info(self, module_info, group_macros):
-        expanded_mod_info = {}
-        for k, v in module_info.items():
-            if k == "include":
-                for info in module_info["include"]:
-                    ref = info["ref"]
-                    if ref == "FuncGroup":
-                        if group_macros is None:
-                            continue
-                        expanded_mod_info["modules"] = group_macros
-                    else:
-                        if "cond" in info:
-                            if not self._object_is_required_or_allowed(info["cond"])[0]:
-                                continue
-                        expanded_mod_info.update(
-                            self._get_module_info(ref, group_macros)
-                        )
-            elif isinstance(v, dict):
-                expanded_mod_info[k] = self._expanded_module_info(v, group_macros)
-            else:
-                expanded_mod_info[k] = v
-        return expanded_mod_info
-
-    def _log_module_required(self, module_name, required, allowed, condition_dict):
+    def _log_module_required(self, module_name, required, allowed, condition):
         msg = f'Module "{module_name}" is '
         msg += "required" if required else "optional" if allowed else "not allowed"
-        if condition_dict:
-            msg += self._condition_message(condition_dict)
+        if condition:
+            msg += condition.message(self._dicom_info.dictionary)
         self.logger.debug(msg)
 
     def _unexpected_tag_errors(self):
         errors = {}
         for tag_id in self._dataset_stack[-1].unexpected_tags:
-            message = self._incorrect_tag_message(tag_id, "unexpected")
-            errors.setdefault(message, []).append(self._tag_id_string(tag_id))
+            errors[self._tag_error(tag_id, ErrorKind.Unexpected)] = None
         return errors
 
-    def _tag_context_message(self):
+    def _tag_error(self, tag_id, error_kind, condition=None, details=""):
         if len(self._dataset_stack) > 1:
-            m = " > ".join([item.name for item in self._dataset_stack])
-            context = f" in  {m}"
-            return context
-        return ""
-
-    def _incorrect_tag_message(self, tag_id, error_kind, extra_message=""):
-        tag_name = tag_name_from_id(tag_id, self._dicom_info.dictionary)
-        if " is " not in error_kind:
-            error_kind = f"is {error_kind}"
-        msg = f"Tag {tag_name} {error_kind}{self._tag_context_message()}"
-        if len(extra_message) != 0:
-            msg = f"{msg} {extra_message}"
-        return msg
-
-    def _condition_message(self, condition_dict):
-        if condition_dict is None:
-            return ""
-        msg = ""
-        condition = Condition.read_condition(condition_dict)
-        if condition.type != ConditionType.UserDefined:
-            msg += (
-                f"due to condition:\n  "
-                f"'{condition.to_string(self._dicom_info.dictionary)}'"
-            )
-        return msg
+            module = self._dataset_stack[0].name
+            path = self._dataset_stack[-1].path
+        else:
+            module, path = None, ()
+        return TagError(tag_id, error_kind, module, path, condition, details)
 
     # For debugging
     @staticmethod
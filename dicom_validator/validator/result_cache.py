@@ -0,0 +1,176 @@
+"""
+Persistent cache of validation results for incremental validation.
+The results are stored in an SQLite database by file path together with the
+file size and modification time, so that unchanged files don't have to be
+read and validated again. Results are only reused for the same package
+version, DICOM revision, DICOM specification files and validation settings.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+
+from dicom_validator import __version__
+from dicom_validator.pickle_cache import pickled, unpickled
+
+
+class ResultCache:
+    """SQLite based cache of validation results by file path.
+
+    Parameters
+    ----------
+    path : str | Path
+        The path of the SQLite database file; it is created if it does not exist.
+    revision : str | None
+        The DICOM revision used for validation. Results stored for
+        another revision are not used.
+    use_content_hash : bool
+        If True, the SHA-256 hash of the file contents is stored additionally,
+        and a file with changed modification time but the same size and
+        contents is considered unchanged.
+    spec_fingerprint : str | None
+        A fingerprint of the DICOM specification files used for validation
+        (see `EditionReader.spec_fingerprint`). Results stored for other
+        specification files, e.g. before recreating them, are not used.
+    """
+
+    # number of stored results after which the changes are committed
+    commit_interval = 500
+
+    def __init__(
+        self, path, revision=None, use_content_hash=False, spec_fingerprint=None
+    ):
+        self.path = path
+        self._revision = revision
+        self._spec_fingerprint = spec_fingerprint
+        self._use_content_hash = use_content_hash
+        self._pending = 0
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "path TEXT NOT NULL, settings TEXT NOT NULL, "
+            "size INTEGER NOT NULL, mtime INTEGER NOT NULL, "
+            "content_hash TEXT, result BLOB NOT NULL, "
+            "PRIMARY KEY (path, settings))"
+        )
+        self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def settings_key(self, settings):
+        """Return the key for the given validator settings, including
+        the package version, the DICOM revision and the spec fingerprint."""
+        return json.dumps(
+            dict(
+                settings,
+                version=__version__,
+                revision=self._revision,
+                spec=self._spec_fingerprint,
+            ),
+            sort_keys=True,
+        )
+
+    def get(self, file_path, stat, settings_key):
+        """Return the stored result for the given file,
+        or None if no result exists or the file has changed.
+
+        Parameters
+        ----------
+        file_path : str
+            The path of the validated file.
+        stat : os.stat_result
+            The current status of the file.
+        settings_key : str
+            The key of the validator settings (see `settings_key`).
+        """
+        row = self._connection.execute(
+            "SELECT size, mtime, content_hash, result FROM results "
+            "WHERE path = ? AND settings = ?",
+            (self._key_path(file_path), settings_key),
+        ).fetchone()
+        if row is None:
+            return None
+        size, mtime, content_hash, result = row
+        if size != stat.st_size:
+            return None
+        if mtime != stat.st_mtime_ns:
+            if (
+                not self._use_content_hash
+                or content_hash is None
+                or content_hash != self._content_hash(file_path)
+            ):
+                return None
+            # same contents - only update the modification time
+            self._connection.execute(
+                "UPDATE results SET mtime = ? WHERE path = ? AND settings = ?",
+                (stat.st_mtime_ns, self._key_path(file_path), settings_key),
+            )
+            self._changed()
+        return unpickled(result)
+
+    def put(self, file_path, stat, settings_key, result):
+        """Store the validation result for the given file.
+
+        Parameters
+        ----------
+        file_path : str
+            The path of the validated file.
+        stat : os.stat_result
+            The status of the file before it has been validated.
+        settings_key : str
+            The key of the validator settings (see `settings_key`).
+        result : dict
+            The validation errors for the file.
+        """
+        content_hash = None
+        if self._use_content_hash:
+            try:
+                content_hash = self._content_hash(file_path)
+            except OSError as e:
+                logging.getLogger().debug("Failed to read %s: %s", file_path, e)
+                return
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self._key_path(file_path),
+                settings_key,
+                stat.st_size,
+                stat.st_mtime_ns,
+                content_hash,
+                pickled(result),
+            ),
+        )
+        self._changed()
+
+    def commit(self):
+        """Write all pending changes to the database."""
+        self._connection.commit()
+        self._pending = 0
+
+    def close(self):
+        """Commit all pending changes and close the database."""
+        self.commit()
+        self._connection.close()
+
+    def _changed(self):
+        self._pending += 1
+        if self._pending >= self.commit_interval:
+            self.commit()
+
+    @staticmethod
+    def _key_path(file_path):
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def _content_hash(file_path):
+        content_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                content_hash.update(block)
+        return content_hash.hexdigest()
@@ -0,0 +1,124 @@
+import enum
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional, Tuple
+
+from dicom_validator.tag_tools import tag_name_from_id, tag_id_string
+
+
+class ErrorKind(str, enum.Enum):
+    """The kind of a tag error, with the text used in the error message."""
+
+    Missing = "missing"
+    NotAllowed = "not allowed"
+    Empty = "empty"
+    Unexpected = "unexpected"
+    InvalidValue = "value is not allowed"
+    ConflictingVR = "conflicting with VR"
+    InBothGroups = "present in both Shared and Per Frame Functional Groups"
+
+
+@dataclass(frozen=True)
+class TagError:
+    """A validation error for a single tag.
+    The error message is only created on output, so that errors can be compared
+    and combined using their attributes.
+
+    Attributes:
+        tag_id: int
+            The ID of the tag the error refers to.
+        kind: ErrorKind
+            The kind of the error.
+        module: str | None
+            The name of the module containing the top-level sequence,
+            if the tag is contained in a sequence.
+        path: tuple[tuple[int, int], ...]
+            The tag IDs and item indexes of the sequences leading to the
+            dataset the tag was found in, or an empty tuple for top-level tags.
+            Errors that only differ in the item indexes are regarded as equal,
+            in which case the path refers to one of the items.
+        condition: CompiledCondition | None
+            The condition of the tag, if the error depends on it.
+        details: str
+            Information about the invalid value for value errors.
+        sequence_tag_ids: tuple[int, ...]
+            The tag IDs of the sequences in `path`.
+    """
+
+    tag_id: int
+    kind: ErrorKind
+    module: Optional[str] = None
+    path: Tuple[Tuple[int, int], ...] = field(default=(), compare=False)
+    condition: Any = None
+    details: str = ""
+    sequence_tag_ids: Tuple[int, ...] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "sequence_tag_ids", tuple(tag_id for tag_id, _ in self.path)
+        )
+
+    @property
+    def tag_id_string(self):
+        return tag_id_string(self.tag_id)
+
+    def in_sequence(self, seq_tag_id, other_seq_tag_id):
+        """Return the same error with the given sequence replaced by the
+        other sequence in the path."""
+        return replace(
+            self,
+            path=tuple(
+                (other_seq_tag_id if tag_id == seq_tag_id else tag_id, index)
+                for tag_id, index in self.path
+            ),
+        )
+
+    def message(self, dictionary):
+        """Return the error message as shown in the output.
+
+        Parameters
+        ----------
+        dictionary : dict
+            The DICOM dictionary used to get the tag and condition tag names.
+        """
+        kind = self.kind.value
+        if " is " not in kind:
+            kind = f"is {kind}"
+        msg = f"Tag {tag_name_from_id(self.tag_id, dictionary)} {kind}"
+        if self.path:
+            sequences = " > ".join(
+                tag_id_string(tag_id) for tag_id in self.sequence_tag_ids
+            )
+            msg += f" in  {self.module} > {sequences}"
+        details = self.details
+        if not details and self.condition is not None:
+            details = self.condition.message(dictionary)
+        if details:
+            msg += f" {details}"
+        return msg
+
+
+def error_messages(error_records, dictionary):
+    """Return the error messages for the given error records.
+
+    Parameters
+    ----------
+    error_records : dict
+        The `TagError` records by module name as collected by the validator,
+        or the message of a fatal error with the key "fatal".
+    dictionary : dict
+        The DICOM dictionary used to get the tag and condition tag names.
+
+    Returns
+    -------
+    dict
+        The error messages by module name, each mapped to the list of
+        related tag ID strings, or the fatal error message.
+    """
+    if "fatal" in error_records:
+        return {"fatal": error_records["fatal"]}
+    return {
+        module_name: {
+            error.message(dictionary): [error.tag_id_string] for error in errors
+        }
+        for module_name, errors in error_records.items()
+    }
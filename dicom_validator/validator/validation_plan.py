@@ -0,0 +1,393 @@
+"""
+Compiled validation plans for SOP classes.
+The module information read from the JSON files is expanded once per SOP class
+into attribute tables keyed by integer tag IDs, with all unconditional includes
+already resolved. Only conditional includes have to be evaluated at validation
+time, as they depend on the validated dataset.
+"""
+
+import json
+
+from dicom_validator.spec_reader.condition import (
+    Condition,
+    ConditionOperator,
+    ConditionType,
+)
+from dicom_validator.tag_tools import tag_id_from_string
+
+
+def compiled_condition(condition):
+    """Return the compiled condition for the given condition dict
+    (see `Condition`) or serialized condition, or None if no condition is given.
+    """
+    if condition is None:
+        return None
+    if isinstance(condition, str):
+        condition = json.loads(condition)
+    return CompiledCondition(
+        Condition.read_condition(condition), json.dumps(condition, sort_keys=True)
+    )
+
+
+class CompiledCondition:
+    """A condition prepared for evaluation, with the integer tag ID
+    resolved and the compared values converted once per value type.
+
+    Attributes:
+        condition: Condition
+            The condition the object is compiled from.
+        key: str | None
+            A canonical string representation of the top-level condition,
+            which is the same for equal conditions in different modules;
+            None for sub-conditions.
+        type: ConditionType | None
+            The condition type, None for sub-conditions.
+        tag_id: int | None
+            The integer ID of the checked tag, if any.
+    """
+
+    __slots__ = (
+        "condition",
+        "key",
+        "type",
+        "operator",
+        "tag_id",
+        "index",
+        "values",
+        "and_conditions",
+        "or_conditions",
+        "other_condition",
+        "user_defined",
+        "_typed_values",
+        "_message",
+    )
+
+    def __init__(self, condition, key=None):
+        self.condition = condition
+        self.key = key
+        self.type = ConditionType(condition.type) if condition.type else None
+        self.operator = (
+            ConditionOperator(condition.operator) if condition.operator else None
+        )
+        self.tag_id = tag_id_from_string(condition.tag) if condition.tag else None
+        self.index = condition.index
+        self.values = condition.values
+        self.and_conditions = [CompiledCondition(c) for c in condition.and_conditions]
+        self.or_conditions = [CompiledCondition(c) for c in condition.or_conditions]
+        self.other_condition = (
+            CompiledCondition(condition.other_condition)
+            if condition.other_condition is not None
+            else None
+        )
+        self.user_defined = self.type is not None and self.type.user_defined
+        # the condition values converted to the type of the compared tag value
+        self._typed_values = {}
+        self._message = None
+
+    def message(self, dictionary):
+        """Return the description of the condition used in error messages."""
+        if self._message is None:
+            self._message = ""
+            if self.type != ConditionType.UserDefined:
+                self._message = (
+                    f"due to condition:\n  '{self.condition.to_string(dictionary)}'"
+                )
+        return self._message
+
+    def tag_ids(self):
+        """Return the IDs of all tags checked in the condition."""
+        tag_ids = set() if self.tag_id is None else {self.tag_id}
+        for condition in self.and_conditions + self.or_conditions:
+            tag_ids.update(condition.tag_ids())
+        if self.other_condition is not None:
+            tag_ids.update(self.other_condition.tag_ids())
+        return tag_ids
+
+    def evaluate(self, lookup_tag):
+        """Check if the related object is required or allowed.
+
+        Parameters
+        ----------
+        lookup_tag : Callable[[int], DataElement | None]
+            Returns the data element with the given tag ID in the currently
+            validated dataset or its parent datasets, or None.
+
+        Returns
+        -------
+        tuple(bool, bool)
+            The first attribute is `True` if the object is required,
+            the second if it is allowed.
+        """
+        if self.user_defined:
+            return False, True
+        if self.is_fulfilled(lookup_tag):
+            return True, True
+        allowed = (
+            self.type == ConditionType.MandatoryOrUserDefined
+            or self.type == ConditionType.MandatoryOrConditional
+            and self.other_condition.is_fulfilled(lookup_tag)
+        )
+        return False, allowed
+
+    def is_fulfilled(self, lookup_tag):
+        """Return `True` if the condition is fulfilled in the current dataset."""
+        if self.and_conditions:
+            return all(cond.is_fulfilled(lookup_tag) for cond in self.and_conditions)
+        if self.or_conditions:
+            return any(cond.is_fulfilled(lookup_tag) for cond in self.or_conditions)
+        operator = self.operator
+        data_elem = lookup_tag(self.tag_id)
+        if operator == ConditionOperator.Present:
+            return data_elem is not None
+        if operator == ConditionOperator.Absent:
+            return data_elem is None
+        if data_elem is None:
+            return False
+        tag_value = None
+        index = self.index
+        if index > 0:
+            if index <= data_elem.VM:
+                tag_value = data_elem.value[index - 1]
+        elif data_elem.VM > 1:
+            tag_value = data_elem.value[0]
+        else:
+            tag_value = data_elem.value
+        if tag_value is None:
+            return False
+        if operator == ConditionOperator.NotEmpty:
+            return True
+        return self._matches(tag_value)
+
+    def _matches(self, tag_value):
+        value_type = type(tag_value)
+        values = self._typed_values.get(value_type)
+        if values is None:
+            values = tuple(value_type(value) for value in self.values)
+            self._typed_values[value_type] = values
+        operator = self.operator
+        if operator == ConditionOperator.EqualsValue:
+            return tag_value in values
+        if operator == ConditionOperator.NotEqualsValue:
+            return tag_value not in values
+        if operator == ConditionOperator.GreaterValue:
+            return tag_value > values[0]
+        if operator == ConditionOperator.LessValue:
+            return tag_value < values[0]
+        if operator == ConditionOperator.EqualsTag:
+            return tag_value in values
+        return False
+
+
+class AttributeInfo:
+    """The validation-relevant information of a single module attribute."""
+
+    __slots__ = ("tag_id", "tag_id_string", "type", "cond", "enums", "items")
+
+    def __init__(self, tag_id, tag_id_string, attribute, items=None):
+        self.tag_id = tag_id
+        self.tag_id_string = tag_id_string
+        self.type = attribute["type"]
+        self.cond = compiled_condition(attribute.get("cond"))
+        self.enums = attribute.get("enums")
+        # the attributes allowed in sequence items, None for non-sequence tags
+        self.items = items
+
+    def resolved(self, include_required):
+        if self.items is None or self.items.is_static:
+            return self
+        attribute = AttributeInfo.__new__(AttributeInfo)
+        for name in self.__slots__:
+            setattr(attribute, name, getattr(self, name))
+        attribute.items = self.items.resolved(include_required)
+        return attribute
+
+
+class AttributeTable:
+    """The attributes of a module or a sequence item.
+
+    Attributes:
+        attributes: dict
+            The attribute information with the integer tag ID as key.
+        group_macros: list[ModulePlan] | None
+            The functional group macros allowed at this level, if the
+            table includes them, otherwise None.
+        conditional_includes: list[tuple[CompiledCondition, AttributeTable]]
+            The compiled conditions and related attribute tables of the includes
+            that have to be evaluated at validation time.
+        is_static: bool
+            True if neither the table nor any of the contained sequence item
+            tables has conditional includes.
+    """
+
+    def __init__(self):
+        self.attributes = {}
+        self.group_macros = None
+        self.conditional_includes = []
+        self.is_static = True
+
+    def update(self, other):
+        self.attributes.update(other.attributes)
+        if other.group_macros is not None:
+            self.group_macros = other.group_macros
+        self.conditional_includes.extend(other.conditional_includes)
+        self.is_static = self.is_static and other.is_static
+
+    def resolved(self, include_required):
+        """Return a static table with all conditional includes resolved.
+
+        Parameters
+        ----------
+        include_required : Callable[[CompiledCondition], bool]
+            Evaluates an include condition in the currently validated dataset.
+        """
+        if self.is_static:
+            return self
+        table = AttributeTable()
+        table.attributes = {
+            tag_id: attribute.resolved(include_required)
+            for tag_id, attribute in self.attributes.items()
+        }
+        table.group_macros = self.group_macros
+        for condition, included_table in self.conditional_includes:
+            if include_required(condition):
+                table.update(included_table.resolved(include_required))
+        return table
+
+
+class ModulePlan:
+    """A module as used in an IOD or in a functional group.
+
+    Attributes:
+        name: str
+            The module name as listed in the standard.
+        ref: str
+            The section in PS3.3 describing the module.
+        use: str
+            The module usage (e.g. "M" for mandatory).
+        cond: CompiledCondition | None
+            The compiled usage condition.
+        attributes: AttributeTable
+            The compiled module attributes.
+        is_group_macro: bool
+            True if the module is a functional group macro.
+    """
+
+    def __init__(self, name, module, attributes, is_group_macro):
+        self.name = name
+        self.ref = module["ref"]
+        self.use = module["use"]
+        self.cond = compiled_condition(module.get("cond"))
+        self.attributes = attributes
+        self.is_group_macro = is_group_macro
+
+
+class ValidationPlan:
+    """The compiled modules of a single SOP class."""
+
+    def __init__(self, title, modules):
+        self.title = title
+        self.modules = modules
+        self._condition_tag_ids = None
+
+    @property
+    def condition_tag_ids(self):
+        """The IDs of all tags checked in any condition of the plan."""
+        if self._condition_tag_ids is None:
+            tag_ids = set()
+            visited = set()
+            for module in self.modules:
+                self._collect_module_condition_tags(module, tag_ids, visited)
+            self._condition_tag_ids = tag_ids
+        return self._condition_tag_ids
+
+    @classmethod
+    def _collect_module_condition_tags(cls, module, tag_ids, visited):
+        if module.cond is not None:
+            tag_ids.update(module.cond.tag_ids())
+        cls._collect_table_condition_tags(module.attributes, tag_ids, visited)
+
+    @classmethod
+    def _collect_table_condition_tags(cls, table, tag_ids, visited):
+        # tables are shared between modules and plans
+        if id(table) in visited:
+            return
+        visited.add(id(table))
+        for attribute in table.attributes.values():
+            if attribute.cond is not None:
+                tag_ids.update(attribute.cond.tag_ids())
+            if attribute.items is not None:
+                cls._collect_table_condition_tags(attribute.items, tag_ids, visited)
+        for module in table.group_macros or []:
+            cls._collect_module_condition_tags(module, tag_ids, visited)
+        for condition, included_table in table.conditional_includes:
+            tag_ids.update(condition.tag_ids())
+            cls._collect_table_condition_tags(included_table, tag_ids, visited)
+
+
+class ValidationPlanCompiler:
+    """Compiles and caches validation plans for the SOP classes
+    in the given module and IOD information.
+    The attribute tables of modules without functional group macros
+    are shared between all plans.
+    """
+
+    def __init__(self, iods, modules):
+        self._iods = iods
+        self._modules = modules
+        self._plans = {}
+        self._tables = {}
+
+    def plan(self, sop_class_uid):
+        """Return the validation plan for the given SOP Class UID."""
+        plan = self._plans.get(sop_class_uid)
+        if plan is None:
+            iod_info = self._iods[sop_class_uid]
+            group_macros = [
+                ModulePlan(name, module, self._table(module["ref"], None), True)
+                for name, module in iod_info["group_macros"].items()
+            ]
+            modules = [
+                ModulePlan(
+                    name, module, self._table(module["ref"], group_macros), False
+                )
+                for name, module in iod_info["modules"].items()
+            ]
+            plan = ValidationPlan(iod_info["title"], modules)
+            self._plans[sop_class_uid] = plan
+        return plan
+
+    def _table(self, module_ref, group_macros):
+        if group_macros is not None:
+            return self._compile_table(self._modules[module_ref], group_macros)
+        table = self._tables.get(module_ref)
+        if table is None:
+            table = self._compile_table(self._modules[module_ref], None)
+            self._tables[module_ref] = table
+        return table
+
+    def _compile_table(self, module_info, group_macros):
+        table = AttributeTable()
+        for tag_id_string, attribute in module_info.items():
+            if tag_id_string == "include":
+                continue
+            items = None
+            if "items" in attribute:
+                items = self._compile_table(attribute["items"], group_macros)
+                table.is_static = table.is_static and items.is_static
+            tag_id = tag_id_from_string(tag_id_string)
+            table.attributes[tag_id] = AttributeInfo(
+                tag_id, tag_id_string, attribute, items
+            )
+        for info in module_info.get("include", []):
+            ref = info["ref"]
+            if ref == "FuncGroup":
+                if group_macros is not None:
+                    table.group_macros = group_macros
+            elif "cond" in info:
+                table.conditional_includes.append(
+                    (compiled_condition(info["cond"]), self._table(ref, group_macros))
+                )
+                table.is_static = False
+            else:
+                table.update(self._table(ref, group_macros))
+        return table
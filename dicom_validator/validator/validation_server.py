@@ -0,0 +1,136 @@
+"""
+Local HTTP server that validates DICOM files using a long-living validator.
+The DICOM information and the compiled validation plans are kept in memory
+between requests, so that each request only pays for the validation itself.
+
+Supported requests:
+    GET /status
+        Returns the package version and the used DICOM revision.
+    POST /validate with a JSON body {"paths": [<file or directory path>, ...]}
+        Validates the given files or directories on the local file system.
+        Only supported if the server is bound to a loopback address, as
+        otherwise remote clients could probe the local file system.
+    POST /validate?name=<name> with the DICOM data as body
+        Validates the posted DICOM data; the result is keyed by the given name.
+The response to a validation request is the error dictionary as JSON,
+with the file paths or names as keys.
+"""
+
+import ipaddress
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from dicom_validator import __version__
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if urlsplit(self.path).path != "/status":
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+            return
+        self._send_json(
+            HTTPStatus.OK, {"version": __version__, "revision": self.server.revision}
+        )
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/validate":
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+            return
+        body = self.rfile.read(length)
+        validator = self.server.validator
+        try:
+            if self.headers.get_content_type() == "application/json":
+                if not self.server.allows_paths:
+                    self.server.logger.warning(
+                        "Rejected validation request for local paths from %s",
+                        self.client_address[0],
+                    )
+                    self._send_error(
+                        HTTPStatus.FORBIDDEN,
+                        "Validation of local paths is only supported "
+                        "if the server is bound to a loopback address",
+                    )
+                    return
+                try:
+                    paths = json.loads(body)["paths"]
+                except (ValueError, KeyError, TypeError):
+                    paths = None
+                if not isinstance(paths, list):
+                    self._send_error(HTTPStatus.BAD_REQUEST, "Expected a list of paths")
+                    return
+                errors = {}
+                for path in paths:
+                    errors.update(validator.validate(path))
+            else:
+                name = parse_qs(url.query).get("name", ["dicom"])[0]
+                errors = validator.validate_bytes(body, name)
+        except Exception as e:
+            self.server.logger.exception("Failed to handle validation request")
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+            return
+        if validator.quiet:
+            errors = validator.error_messages(errors)
+        self._send_json(HTTPStatus.OK, errors)
+
+    def log_message(self, format, *args):
+        self.server.logger.debug(format, *args)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {"error": message})
+
+    def _send_json(self, status, contents):
+        response = json.dumps(contents).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+class ValidationServer(HTTPServer):
+    """HTTP server that validates DICOM data using the given validator.
+
+    Parameters
+    ----------
+    validator : DicomFileValidator
+        The validator used for all requests.
+    host : str
+        The host name the server is bound to, per default only local
+        connections are accepted. If the server is not bound to a loopback
+        address, requests to validate local paths are rejected.
+    port : int
+        The port the server listens to; if 0, a free port is used.
+    revision : str | None
+        The DICOM revision used by the validator, shown in the status.
+    """
+
+    def __init__(self, validator, host="127.0.0.1", port=0, revision=None):
+        super().__init__((host, port), ValidationRequestHandler)
+        self.validator = validator
+        self.revision = revision
+        self.logger = logging.getLogger()
+        if not self.allows_paths:
+            self.logger.warning(
+                "Server is not bound to a loopback address - "
+                "requests to validate local paths are rejected"
+            )
+
+    @property
+    def allows_paths(self):
+        """True if requests to validate local paths are accepted,
+        which is only the case for servers bound to a loopback address."""
+        try:
+            return ipaddress.ip_address(self.server_address[0]).is_loopback
+        except ValueError:
+            return False